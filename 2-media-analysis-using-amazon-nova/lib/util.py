@@ -1,33 +1,57 @@
 import os
 import json
 import math
+import posixpath
 from fractions import Fraction
+from functools import lru_cache
 from shutil import rmtree
-import boto3
+
+# orjson serializes straight to UTF-8 bytes and is several times faster than
+# json.dump on large transcript/analysis payloads
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Files above 8 MiB are uploaded as parallel multipart chunks
+S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+S3_MAX_CONCURRENCY = 8
+
+def _write_json(output_file, data):
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
 
 def save_to_file(output_file, data):
-    with open(output_file, 'w', encoding='utf-8') as f:
-        if isinstance(data, str):
+    if isinstance(data, str):
+        with open(output_file, 'w', encoding='utf-8') as f:
             f.write(data)
-        else:
-            json.dump(data, f, ensure_ascii=False)
+    else:
+        _write_json(output_file, data)
     return output_file
 
 def save_json_to_file(name, json_data):
-    with open(name, 'w', encoding='utf-8') as f:
-        json.dump(json_data, f, ensure_ascii=False)
+    _write_json(name, json_data)
     return json_data
 
 def to_hhmmssms(milliseconds):
-    hh = math.floor(milliseconds / 3600000)
-    mm = math.floor((milliseconds % 3600000) / 60000)
-    ss = math.floor((milliseconds % 60000) / 1000)
-    ms = math.ceil(milliseconds % 1000)
+    # partial milliseconds round up; the rest is integer divmod
+    ss, ms = divmod(math.ceil(milliseconds), 1000)
+    mm, ss = divmod(ss, 60)
+    hh, mm = divmod(mm, 60)
     return f"{hh:02d}:{mm:02d}:{ss:02d}.{ms:03d}"
 
+@lru_cache(maxsize=128)
+def _to_fraction_str(s):
+    # rates/aspect ratios ("30000:1001", "16:9") repeat across calls
+    return Fraction(s.replace(':', '/'))
+
 def to_fraction(s):
     if isinstance(s, str):
-        return Fraction(s.replace(':', '/')) 
+        return _to_fraction_str(s)
     return Fraction(s)
 
 def smpte_to_milliseconds(smpte):
@@ -37,26 +61,29 @@ def seconds_to_milliseconds(seconds):
     return seconds * 1000
     
 def mkdir(directory):
-    if not os.path.exists(directory):
-        os.mkdir(directory)
+    os.makedirs(directory, exist_ok=True)
     
 
 def rmdir(directory):
-    if os.path.exists(directory):
-        rmtree(directory)
+    rmtree(directory, ignore_errors=True)
+
+@lru_cache(maxsize=None)
+def _s3_transfer():
+    # boto3 is only needed for uploads, so it is imported on the first one;
+    # the client is created once and shared (botocore clients are thread-safe)
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+
+    config = TransferConfig(multipart_threshold=S3_MULTIPART_THRESHOLD, max_concurrency=S3_MAX_CONCURRENCY, use_threads=True)
+    return boto3.client('s3'), config
 
 def upload_object(bucket, prefix, file):
         
-        key = os.path.join(prefix, file)
-
-        s3_client = boto3.client('s3')
+        # S3 keys are always '/'-separated, whatever the local OS
+        key = posixpath.join(prefix, file)
 
-        with open(file, "rb") as f:
-            response = s3_client.put_object(
-                Body=f,
-                Bucket=bucket,
-                Key=key,
-            )
+        s3_client, config = _s3_transfer()
+        s3_client.upload_file(file, bucket, key, Config=config)
         return {"Bucket":bucket, "Key":key}
     
 
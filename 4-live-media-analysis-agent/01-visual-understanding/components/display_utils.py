@@ -3,262 +3,255 @@ Display utilities for visual understanding analysis results
 """
 
 import json
-import tempfile
 import subprocess
-import base64
+import binascii
 import os
+from pathlib import Path
 from IPython.display import HTML, display
 
+# orjson is 2-3x faster for large analysis payloads; its JSONDecodeError
+# subclasses json.JSONDecodeError so error handling is unchanged
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-def create_video_clip(video_path, start_time, end_time, clip_id):
-    """Create video clip and return base64 data for embedding"""
+# Translation table for escaping model-generated text in one C-level pass
+_HTML_ESC = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'})
+
+
+def _esc(value):
+    """Escape a value for safe interpolation into HTML"""
+    return str(value).translate(_HTML_ESC)
+
+
+# Static markup is built once at import; sections use native <details>/<summary>
+# toggling, so no script is needed
+_STYLE_BLOCK = (
+    "<style>"
+    ".section-container{border:2px solid #ddd;border-radius:8px;margin:10px 0;background:#f9f9f9}"
+    ".section-header{background:linear-gradient(135deg,#667eea 0%,#764ba2 100%);color:white;padding:15px;cursor:pointer;border-radius:6px 6px 0 0;font-weight:bold}"
+    ".section-content{padding:20px}"
+    ".overview-section{background:#e3f2fd;padding:15px;border-radius:8px;border-left:4px solid #2196f3}"
+    ".text-section{background:#fff3e0;padding:15px;border-radius:8px;border-left:4px solid #ff9800}"
+    ".visual-section{background:#e8f5e9;padding:15px;border-radius:8px;border-left:4px solid #4caf50}"
+    ".chapter-section{background:#f3e5f5;padding:15px;border-radius:8px;border-left:4px solid #9c27b0;margin:10px 0}"
+    ".safety-section{background:#ffebee;padding:15px;border-radius:8px;border-left:4px solid #f44336}"
+    ".movement-section{background:#f1f8e9;padding:15px;border-radius:8px;border-left:4px solid #8bc34a}"
+    ".spatial-section{background:#fce4ec;padding:15px;border-radius:8px;border-left:4px solid #e91e63}"
+    ".color-section{background:#fff8e1;padding:15px;border-radius:8px;border-left:4px solid #ffc107}"
+    ".video-clip{background:#f0f0f0;padding:10px;border-radius:5px;margin:10px 0}"
+    "</style>"
+)
+_HEADER = _STYLE_BLOCK + "<h2>📹 Video Analysis Results</h2>"
+
+_SECTION_OPEN = (
+    '<details class="section-container">'
+    '<summary class="section-header">{title} - Click to expand</summary>'
+    '<div class="section-content"><div class="{css_class}">'
+)
+_SECTION_CLOSE = "</div></div></details>"
+_LIST_SECTION = _SECTION_OPEN + "<ul>{items}</ul>" + _SECTION_CLOSE
+
+_OVERVIEW_SECTION = (
+    _SECTION_OPEN.replace('{title}', '🎬 Overview - {title}').replace('{css_class}', 'overview-section')
+    + "<p><strong>Title:</strong> {title}</p>"
+    "<p><strong>Genre:</strong> {genre}</p>"
+    "<p><strong>Duration:</strong> {duration_analyzed}</p>"
+    "<p><strong>Frames:</strong> {total_frames_analyzed}</p>"
+    "<p><strong>Summary:</strong> {summary}</p>"
+    + _SECTION_CLOSE
+)
+
+_VISUAL_LISTS = (
+    "<h4>👥 People Details:</h4><ul>{people_details}</ul>"
+    "<h4>🎯 Object Details:</h4><ul>{object_details}</ul>"
+    "<h4>🌍 Environment Details:</h4><ul>{environment_details}</ul>"
+)
+
+# (analysis key, header label, css class) - visual elements render between index 3 and 4
+_LIST_SECTIONS = (
+    ('text_recognition', '📝 Text Recognition', 'text-section'),
+    ('movement_dynamics', '🏃 Movement & Dynamics', 'movement-section'),
+    ('spatial_compositions', '📐 Spatial Compositions', 'spatial-section'),
+    ('color_visual_properties', '🎨 Color & Visual Properties', 'color-section'),
+    ('content_moderation', '🛡️ Content Moderation', 'safety-section'),
+    ('narrative_analysis', '📖 Narrative Analysis', 'visual-section'),
+)
+
+_CHAPTERS_OPEN = (
+    '<details class="section-container">'
+    '<summary class="section-header">📚 Chapters ({count} segments) - Click to expand</summary>'
+    '<div class="section-content">'
+)
+_CHAPTERS_CLOSE = "</div></details>"
+
+_CHAPTER_HEADER = (
+    '<div class="chapter-section">'
+    "<h4>Chapter {chapter_number}: {title}</h4>"
+    "<p><strong>Time:</strong> {start_time}s - {end_time}s ({duration:.1f}s)</p>"
+    "<p><strong>Setting:</strong> {setting}</p>"
+    "<p><strong>Mood:</strong> {mood}</p>"
+    "<p><strong>Description:</strong> {description}</p>"
+)
+
+_VIDEO_CLIP = (
+    '<div class="video-clip">'
+    "<p><strong>🎬 Chapter Video Clip:</strong></p>"
+    '<video controls style="width: 100%; max-width: 600px;">'
+    '<source src="{src}" type="video/mp4">'
+    "Your browser does not support the video element."
+    "</video></div>"
+)
+_CLIP_FAILED = "<p style='color: orange;'>⚠️ Could not generate video clip for this chapter</p>"
+
+
+def _list_items(items):
+    """Render escaped <li> elements for a list of strings"""
+    return ''.join(f"<li>{_esc(item)}</li>" for item in items)
+
+
+def _list_section(label, css_class, details):
+    """Render a collapsible section containing a bulleted list"""
+    return _LIST_SECTION.format_map({
+        'title': f"{label} ({len(details)} items)",
+        'css_class': css_class,
+        'items': _list_items(details),
+    })
+
+
+def _clip_url(clip_path, base_dir=None):
+    """
+    URL for a clip file relative to base_dir (the notebook's directory, by default
+    the kernel's working directory); clips outside base_dir get their absolute path
+    """
+    clip_path = os.path.abspath(clip_path)
+    try:
+        rel_path = os.path.relpath(clip_path, os.path.abspath(base_dir or os.getcwd()))
+    except ValueError:
+        # Different drive on Windows
+        return Path(clip_path).as_posix()
+    if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+        return Path(clip_path).as_posix()
+    return Path(rel_path).as_posix()
+
+
+def create_video_clip(video_path, start_time, end_time, clip_id, clips_dir=None, base_dir=None):
+    """
+    Create a video clip for a chapter (times in float seconds)
+    
+    Returns a URL to the clip file (relative to base_dir) when clips_dir is
+    given, otherwise base64 data for embedding. Returns None on failure.
+    """
     try:
-        duration = float(end_time) - float(start_time)
-        temp_clip = tempfile.NamedTemporaryFile(suffix=f'_clip_{clip_id}.mp4', delete=False)
-        clip_path = temp_clip.name
-        temp_clip.close()
+        duration = end_time - start_time
+        if clips_dir:
+            # Write straight to a servable path - no base64 step
+            os.makedirs(clips_dir, exist_ok=True)
+            clip_path = os.path.join(clips_dir, f'chapter_{clip_id:02d}.mp4')
+            output_args = [clip_path]
+        else:
+            # Stream a fragmented MP4 to stdout so the clip never touches disk
+            output_args = ['-movflags', 'frag_keyframe+empty_moov', '-f', 'mp4', 'pipe:1']
         
         # Extract clip using FFmpeg
         ffmpeg_cmd = [
             'ffmpeg', '-y', '-ss', str(start_time), '-t', str(duration),
             '-i', video_path, '-c:v', 'libx264', '-c:a', 'aac', 
-            '-preset', 'fast', '-crf', '23', clip_path
+            '-preset', 'fast', '-crf', '23', *output_args
         ]
         
-        result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
+        result = subprocess.run(ffmpeg_cmd, capture_output=True)
         if result.returncode == 0:
-            # Read video file and encode as base64
-            with open(clip_path, 'rb') as f:
-                video_data = f.read()
-            video_b64 = base64.b64encode(video_data).decode('utf-8')
-            # Clean up temp file
-            os.unlink(clip_path)
-            return video_b64
+            if clips_dir:
+                return _clip_url(clip_path, base_dir)
+            # Encode the piped bytes directly; base64 output is pure ASCII
+            return binascii.b2a_base64(result.stdout, newline=False).decode('ascii')
         return None
     except:
         return None
 
 
-def display_analysis_results(analysis, video_path=None):
+def display_analysis_results(analysis, video_path=None, clips_dir=None, base_dir=None):
     """
     Display video analysis results in a user-friendly collapsible format
     
     Args:
         analysis (str): JSON string containing video analysis results
         video_path (str): Path to the source video file for creating clips
+        clips_dir (str): Optional directory to write chapter clips to; clips are
+            referenced by relative URL instead of being embedded as base64
+        base_dir (str): Directory the notebook is served from, which clip URLs are
+            relative to (default: the current working directory)
     """
     try:
-        analysis_data = json.loads(analysis)
+        analysis_data = _json_loads(analysis)
         video_data = analysis_data['video_analysis']
         
-        html = """
-        <style>
-        .section-container { border: 2px solid #ddd; border-radius: 8px; margin: 10px 0; background: #f9f9f9; }
-        .section-header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 15px; cursor: pointer; border-radius: 6px 6px 0 0; font-weight: bold; }
-        .section-content { padding: 20px; display: none; }
-        .overview-section { background: #e3f2fd; padding: 15px; border-radius: 8px; border-left: 4px solid #2196f3; }
-        .text-section { background: #fff3e0; padding: 15px; border-radius: 8px; border-left: 4px solid #ff9800; }
-        .visual-section { background: #e8f5e9; padding: 15px; border-radius: 8px; border-left: 4px solid #4caf50; }
-        .chapter-section { background: #f3e5f5; padding: 15px; border-radius: 8px; border-left: 4px solid #9c27b0; margin: 10px 0; }
-        .safety-section { background: #ffebee; padding: 15px; border-radius: 8px; border-left: 4px solid #f44336; }
-        .movement-section { background: #f1f8e9; padding: 15px; border-radius: 8px; border-left: 4px solid #8bc34a; }
-        .spatial-section { background: #fce4ec; padding: 15px; border-radius: 8px; border-left: 4px solid #e91e63; }
-        .color-section { background: #fff8e1; padding: 15px; border-radius: 8px; border-left: 4px solid #ffc107; }
-        .video-clip { background: #f0f0f0; padding: 10px; border-radius: 5px; margin: 10px 0; }
-        </style>
-        
-        <script>
-        function toggleSection(sectionId) {
-            var content = document.getElementById('content-' + sectionId);
-            content.style.display = content.style.display === 'none' ? 'block' : 'none';
-        }
-        </script>
-        
-        <h2>📹 Video Analysis Results</h2>
-        """
+        parts = [_HEADER]
         
         # Overview
         overview = video_data['overview']
-        html += f"""
-        <div class="section-container">
-            <div class="section-header" onclick="toggleSection('overview')">
-                🎬 Overview - {overview['title']} - Click to expand
-            </div>
-            <div id="content-overview" class="section-content">
-                <div class="overview-section">
-                    <p><strong>Title:</strong> {overview['title']}</p>
-                    <p><strong>Genre:</strong> {overview['genre']}</p>
-                    <p><strong>Duration:</strong> {overview['duration_analyzed']}</p>
-                    <p><strong>Frames:</strong> {overview['total_frames_analyzed']}</p>
-                    <p><strong>Summary:</strong> {overview['summary']}</p>
-                </div>
-            </div>
-        </div>
-        """
-        
-        # Text Recognition
-        text_data = video_data['text_recognition']
-        html += f"""
-        <div class="section-container">
-            <div class="section-header" onclick="toggleSection('text')">
-                📝 Text Recognition ({len(text_data['details'])} items) - Click to expand
-            </div>
-            <div id="content-text" class="section-content">
-                <div class="text-section">
-                    <ul>
-        """
-        for detail in text_data['details']:
-            html += f"<li>{detail}</li>"
-        html += "</ul></div></div></div>"
-        
-        # Movement Dynamics
-        movement = video_data['movement_dynamics']
-        html += f"""
-        <div class="section-container">
-            <div class="section-header" onclick="toggleSection('movement')">
-                🏃 Movement & Dynamics ({len(movement['details'])} items) - Click to expand
-            </div>
-            <div id="content-movement" class="section-content">
-                <div class="movement-section">
-                    <ul>
-        """
-        for detail in movement['details']:
-            html += f"<li>{detail}</li>"
-        html += "</ul></div></div></div>"
+        parts.append(_OVERVIEW_SECTION.format_map({
+            key: _esc(overview[key])
+            for key in ('title', 'genre', 'duration_analyzed', 'total_frames_analyzed', 'summary')
+        }))
         
-        # Spatial Compositions
-        spatial = video_data['spatial_compositions']
-        html += f"""
-        <div class="section-container">
-            <div class="section-header" onclick="toggleSection('spatial')">
-                📐 Spatial Compositions ({len(spatial['details'])} items) - Click to expand
-            </div>
-            <div id="content-spatial" class="section-content">
-                <div class="spatial-section">
-                    <ul>
-        """
-        for detail in spatial['details']:
-            html += f"<li>{detail}</li>"
-        html += "</ul></div></div></div>"
-        
-        # Color & Visual Properties
-        color = video_data['color_visual_properties']
-        html += f"""
-        <div class="section-container">
-            <div class="section-header" onclick="toggleSection('color')">
-                🎨 Color & Visual Properties ({len(color['details'])} items) - Click to expand
-            </div>
-            <div id="content-color" class="section-content">
-                <div class="color-section">
-                    <ul>
-        """
-        for detail in color['details']:
-            html += f"<li>{detail}</li>"
-        html += "</ul></div></div></div>"
+        # Text, movement, spatial and color sections share the same list layout
+        for key, label, css_class in _LIST_SECTIONS[:4]:
+            parts.append(_list_section(label, css_class, video_data[key]['details']))
         
         # Visual Elements
         visual = video_data['visual_elements']
-        html += f"""
-        <div class="section-container">
-            <div class="section-header" onclick="toggleSection('visual')">
-                👁️ Visual Elements - Click to expand
-            </div>
-            <div id="content-visual" class="section-content">
-                <div class="visual-section">
-                    <h4>👥 People Details:</h4>
-                    <ul>
-        """
-        for detail in visual['people_details']:
-            html += f"<li>{detail}</li>"
-        
-        html += "</ul><h4>🎯 Object Details:</h4><ul>"
-        for detail in visual['object_details']:
-            html += f"<li>{detail}</li>"
-        
-        html += "</ul><h4>🌍 Environment Details:</h4><ul>"
-        for detail in visual['environment_details']:
-            html += f"<li>{detail}</li>"
-        html += "</ul></div></div></div>"
-        
-        # Content Moderation
-        moderation = video_data['content_moderation']
-        html += f"""
-        <div class="section-container">
-            <div class="section-header" onclick="toggleSection('safety')">
-                🛡️ Content Moderation ({len(moderation['details'])} items) - Click to expand
-            </div>
-            <div id="content-safety" class="section-content">
-                <div class="safety-section">
-                    <ul>
-        """
-        for detail in moderation['details']:
-            html += f"<li>{detail}</li>"
-        html += "</ul></div></div></div>"
+        parts.append(_SECTION_OPEN.format_map({'title': '👁️ Visual Elements', 'css_class': 'visual-section'}))
+        parts.append(_VISUAL_LISTS.format_map({
+            key: _list_items(visual[key])
+            for key in ('people_details', 'object_details', 'environment_details')
+        }))
+        parts.append(_SECTION_CLOSE)
         
-        # Narrative Analysis
-        narrative = video_data['narrative_analysis']
-        html += f"""
-        <div class="section-container">
-            <div class="section-header" onclick="toggleSection('narrative')">
-                📖 Narrative Analysis ({len(narrative['details'])} items) - Click to expand
-            </div>
-            <div id="content-narrative" class="section-content">
-                <div class="visual-section">
-                    <ul>
-        """
-        for detail in narrative['details']:
-            html += f"<li>{detail}</li>"
-        html += "</ul></div></div></div>"
+        # Content Moderation and Narrative Analysis
+        for key, label, css_class in _LIST_SECTIONS[4:]:
+            parts.append(_list_section(label, css_class, video_data[key]['details']))
         
         # Chapters with video clips
         chapters = video_data['chapters']
-        html += f"""
-        <div class="section-container">
-            <div class="section-header" onclick="toggleSection('chapters')">
-                📚 Chapters ({len(chapters)} segments) - Click to expand
-            </div>
-            <div id="content-chapters" class="section-content">
-        """
+        parts.append(_CHAPTERS_OPEN.format_map({'count': len(chapters)}))
         
         for i, chapter in enumerate(chapters):
-            duration = float(chapter['end_time']) - float(chapter['start_time'])
-            html += f"""
-            <div class="chapter-section">
-                <h4>Chapter {chapter['chapter_number']}: {chapter['title']}</h4>
-                <p><strong>Time:</strong> {chapter['start_time']}s - {chapter['end_time']}s ({duration:.1f}s)</p>
-                <p><strong>Setting:</strong> {chapter['setting']}</p>
-                <p><strong>Mood:</strong> {chapter['mood']}</p>
-                <p><strong>Description:</strong> {chapter['description']}</p>
-            """
+            # Convert the times once for both the HTML and clip extraction
+            start_f = float(chapter['start_time'])
+            end_f = float(chapter['end_time'])
+            parts.append(_CHAPTER_HEADER.format_map({
+                'chapter_number': _esc(chapter['chapter_number']),
+                'title': _esc(chapter['title']),
+                'start_time': _esc(chapter['start_time']),
+                'end_time': _esc(chapter['end_time']),
+                'duration': end_f - start_f,
+                'setting': _esc(chapter['setting']),
+                'mood': _esc(chapter['mood']),
+                'description': _esc(chapter['description']),
+            }))
             
             # Add video clip if video_path is provided
             if video_path and os.path.exists(video_path):
-                video_b64 = create_video_clip(video_path, chapter['start_time'], chapter['end_time'], i+1)
-                if video_b64:
-                    html += f"""
-                    <div class="video-clip">
-                        <p><strong>🎬 Chapter Video Clip:</strong></p>
-                        <video controls style="width: 100%; max-width: 600px;">
-                            <source src="data:video/mp4;base64,{video_b64}" type="video/mp4">
-                            Your browser does not support the video element.
-                        </video>
-                    </div>
-                    """
+                clip = create_video_clip(video_path, start_f, end_f, i+1, clips_dir, base_dir)
+                if clip:
+                    clip_src = _esc(clip) if clips_dir else f"data:video/mp4;base64,{clip}"
+                    parts.append(_VIDEO_CLIP.format_map({'src': clip_src}))
                 else:
-                    html += "<p style='color: orange;'>⚠️ Could not generate video clip for this chapter</p>"
+                    parts.append(_CLIP_FAILED)
             
             if chapter.get('key_events'):
-                html += "<p><strong>Key Events:</strong></p><ul>"
-                for event in chapter['key_events']:
-                    html += f"<li>{event}</li>"
-                html += "</ul>"
+                parts.append(f"<p><strong>Key Events:</strong></p><ul>{_list_items(chapter['key_events'])}</ul>")
             if chapter.get('characters_present'):
-                html += f"<p><strong>Characters:</strong> {', '.join(chapter['characters_present'])}</p>"
-            html += "</div>"
+                parts.append(f"<p><strong>Characters:</strong> {_esc(', '.join(chapter['characters_present']))}</p>")
+            parts.append("</div>")
         
-        html += "</div></div>"
+        parts.append(_CHAPTERS_CLOSE)
         
-        display(HTML(html))
+        display(HTML(''.join(parts)))
         
     except json.JSONDecodeError:
         print('❌ Invalid JSON response')
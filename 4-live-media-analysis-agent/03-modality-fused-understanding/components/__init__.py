@@ -3,52 +3,81 @@ Modality Fusion Understanding Components
 Module-specific components for combining visual and audio analysis
 """
 
-# Module-specific components
-from .fusion_analyzer import FusionAnalyzer
-from .chunk_processor import ChunkProcessor
-from .chunk_monitor import ChunkMonitor
-from .stream_monitor import StreamMonitor
-from .audio_spectrogram_analyzer import AudioSpectrogramAnalyzer
-from .jupyter_compat import JupyterThreadManager, get_thread_manager, is_jupyter
-from .cleanup_utils import CleanupUtils, cleanup_directory, cleanup_ffmpeg_processes, cleanup_all
-from .processing_utils import ProcessingUtils, start_fusion_processing
+import importlib
 
-# Import shared components for convenience
-try:
-    from src.shared import (
-        ShotChangeDetector,
-        create_visual_detector,
-        create_fusion_detector,
-        RecordingManager,
-        ComponentMonitor,
-        log_component,
-        show_component_table,
-        get_component_summary,
-        TranscriptionHandler,
-        TranscriptionProcessor,
-        AdaptiveFilmstripProcessor,
-        create_fusion_filmstrip_processor,
-        create_visual_filmstrip_processor
-    )
-    # Alias for backward compatibility
-    FilmstripProcessor = AdaptiveFilmstripProcessor
-except ImportError:
-    # Fallback if shared components not available
-    print("⚠️ Warning: Shared components not found. Please ensure src/shared is in Python path.")
-    ShotChangeDetector = None
-    create_visual_detector = None
-    create_fusion_detector = None
-    RecordingManager = None
-    ComponentMonitor = None
-    log_component = lambda c, m, l="INFO": print(f"[{c}] {m}")
-    show_component_table = None
-    get_component_summary = None
-    TranscriptionHandler = None
-    TranscriptionProcessor = None
-    AdaptiveFilmstripProcessor = None
-    FilmstripProcessor = None
-    create_fusion_filmstrip_processor = None
-    create_visual_filmstrip_processor = None
+# Components are imported lazily (PEP 562) so consumers only pay the import
+# cost (numpy, boto3, OpenCV, ...) of the classes they actually use.
+_LAZY = {
+    # Module-specific components
+    'FusionAnalyzer': '.fusion_analyzer',
+    'ChunkProcessor': '.chunk_processor',
+    'ChunkMonitor': '.chunk_monitor',
+    'StreamMonitor': '.stream_monitor',
+    'AudioSpectrogramAnalyzer': '.audio_spectrogram_analyzer',
+    'JupyterThreadManager': '.jupyter_compat',
+    'get_thread_manager': '.jupyter_compat',
+    'is_jupyter': '.jupyter_compat',
+    'CleanupUtils': '.cleanup_utils',
+    'cleanup_directory': '.cleanup_utils',
+    'cleanup_ffmpeg_processes': '.cleanup_utils',
+    'cleanup_all': '.cleanup_utils',
+    'ProcessingUtils': '.processing_utils',
+    'start_fusion_processing': '.processing_utils',
+    
+    # Shared components (re-exported for convenience)
+    'ShotChangeDetector': 'src.shared',
+    'create_visual_detector': 'src.shared',
+    'create_fusion_detector': 'src.shared',
+    'RecordingManager': 'src.shared',
+    'ComponentMonitor': 'src.shared',
+    'log_component': 'src.shared',
+    'show_component_table': 'src.shared',
+    'get_component_summary': 'src.shared',
+    'TranscriptionHandler': 'src.shared',
+    'TranscriptionProcessor': 'src.shared',
+    'AdaptiveFilmstripProcessor': 'src.shared.filmstrip_processor',
+    'create_fusion_filmstrip_processor': 'src.shared',
+    'create_visual_filmstrip_processor': 'src.shared',
+}
+
+# Alias for backward compatibility
+_ALIASES = {'FilmstripProcessor': 'AdaptiveFilmstripProcessor'}
+
+_shared_warning_shown = False
+
+
+def _shared_fallback(name):
+    """Fallback if shared components not available"""
+    global _shared_warning_shown
+    if not _shared_warning_shown:
+        print("⚠️ Warning: Shared components not found. Please ensure src/shared is in Python path.")
+        _shared_warning_shown = True
+    if name == 'log_component':
+        return lambda c, m, l="INFO": print(f"[{c}] {m}")
+    return None
+
+
+def __getattr__(name):
+    target = _ALIASES.get(name, name)
+    module_name = _LAZY.get(target)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    if module_name.startswith('.'):
+        attr = getattr(importlib.import_module(module_name, __name__), target)
+    else:
+        try:
+            attr = getattr(importlib.import_module(module_name), target)
+        except ImportError:
+            attr = _shared_fallback(target)
+    
+    # Memoize so later lookups bypass __getattr__
+    globals()[name] = attr
+    return attr
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 __all__ = [
     # Module-specific components
@@ -11,11 +11,13 @@ import re
 import threading
 import subprocess
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 # Import shared components
 try:
     from src.shared import (
         log_component,
+        is_log_enabled,
         FilmstripProcessor,
         create_fusion_filmstrip_processor,
         create_fusion_detector
@@ -23,6 +25,9 @@ try:
 except ImportError:
     def log_component(component, message, level="INFO"):
         print(f"[{component}] {message}")
+    
+    def is_log_enabled(component, level="DEBUG"):
+        return True
     FilmstripProcessor = None
     create_fusion_filmstrip_processor = None
     create_fusion_detector = None
@@ -39,6 +44,40 @@ except ImportError:
     def is_jupyter():
         return False
 
+# Optional file-system event support. Close-write events (on_closed) come from inotify,
+# so event mode is only used on Linux; other platforms keep polling
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+FS_EVENTS_SUPPORTED = Observer is not None and sys.platform.startswith('linux')
+
+# With events active, the directory is still rescanned at this interval so chunks whose
+# close event was missed or that were not ready yet are picked up
+FS_EVENT_RESCAN_SECONDS = 5.0
+
+# Concurrent ffprobe calls when a scan finds several unprocessed chunks
+PROBE_WORKERS = 4
+
+
+class _ChunkEventHandler(FileSystemEventHandler):
+    """Forwards finished chunk files from watchdog events to a ChunkMonitor"""
+    
+    def __init__(self, monitor):
+        super().__init__()
+        self.monitor = monitor
+    
+    def on_closed(self, event):
+        # Fires on IN_CLOSE_WRITE, i.e. when FFmpeg finishes writing the chunk
+        if not event.is_directory:
+            self.monitor._handle_chunk_file(event.src_path)
+    
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.monitor._handle_chunk_file(event.dest_path)
+
 
 class ChunkMonitor:
     """
@@ -57,7 +96,8 @@ class ChunkMonitor:
         fusion_analyzer=None,
         shot_detector=None,
         filmstrip_processor=None,
-        check_interval=0.5
+        check_interval=0.5,
+        use_fs_events=True
     ):
         """
         Initialize chunk monitor.
@@ -69,6 +109,8 @@ class ChunkMonitor:
             shot_detector: Optional ShotChangeDetector
             filmstrip_processor: Optional FilmstripProcessor
             check_interval: How often to check for new chunks (seconds)
+            use_fs_events: Use watchdog file-system events (Linux) when available, with a
+                           periodic rescan as a fallback; otherwise poll
         """
         log_component("ChunkMonitor", f"🔍 Initializing ChunkMonitor", "DEBUG")
         
@@ -77,8 +119,21 @@ class ChunkMonitor:
         self.fusion_analyzer = fusion_analyzer
         self.check_interval = check_interval
         self.is_running = False
+        self._stop_event = threading.Event()
         self.chunk_count = 0
-        self.processed_chunks = set()
+        # Wall-clock time the latest chunk was picked up (StreamMonitor's activity signal)
+        self.last_chunk_time = None
+        # Chunk IDs are issued in order, so track a contiguous watermark plus
+        # a small set of out-of-order arrivals instead of every ID seen
+        self._next_unprocessed = 0
+        self._out_of_order = set()
+        self.processed_count = 0
+        self.use_fs_events = use_fs_events
+        self._observer = None
+        self._worker_pool = None
+        self._probe_pool = None
+        self._process_lock = threading.Lock()
+        self._chunk_pattern = re.compile(rf'chunk_(\d+)_{re.escape(str(chunk_duration))}s\.mp4$')
         
         # Initialize shot detector
         if shot_detector is None and create_fusion_detector:
@@ -109,10 +164,32 @@ class ChunkMonitor:
             return
         
         self.is_running = True
+        self._stop_event.clear()
+        
+        # Filmstrip creation runs on a worker so the monitor keeps detecting new chunks.
+        # A single worker keeps chunks in submission order: the shared shot detector carries
+        # cross-chunk state and the fusion analyzer's history expects chunks in sequence
+        self._worker_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ChunkMonitor-Worker')
+        # Reused by every scan to ffprobe a backlog of chunks in parallel
+        self._probe_pool = ThreadPoolExecutor(max_workers=PROBE_WORKERS, thread_name_prefix='ChunkMonitor-Probe')
         
         if is_jupyter():
             log_component("ChunkMonitor", "🔧 Detected Jupyter environment - using compatible threading", "DEBUG")
         
+        # Prefer file-system events; fall back to polling when watchdog is unavailable
+        # or the platform has no close-write events
+        if self.use_fs_events and FS_EVENTS_SUPPORTED:
+            try:
+                chunks_dir = f"{self.output_dir}/chunks"
+                os.makedirs(chunks_dir, exist_ok=True)
+                self._observer = Observer()
+                self._observer.schedule(_ChunkEventHandler(self), chunks_dir, recursive=False)
+                self._observer.start()
+                log_component("ChunkMonitor", "👀 Using file-system events for chunk detection", "DEBUG")
+            except Exception as e:
+                log_component("ChunkMonitor", f"⚠️ File-system events unavailable, polling instead: {e}", "WARNING")
+                self._observer = None
+        
         # Start monitoring thread
         self.monitor_thread = create_daemon_thread(
             target=self._monitor_loop,
@@ -131,98 +208,144 @@ class ChunkMonitor:
         log_component("ChunkMonitor", f"Thread ID={threading.current_thread().ident}, Name={threading.current_thread().name}", "DEBUG")
         
         try:
-            while self.is_running:
-                # Check for new chunk files
-                search_pattern = f"{self.output_dir}/chunks/chunk_*_{self.chunk_duration}s.mp4"
-                chunk_files = glob.glob(search_pattern)
-                # Heartbeat logging every 5 seconds
-                current_time = time.time()
-                if not hasattr(self, '_last_heartbeat') or (current_time - self._last_heartbeat) > 5:
-                    log_component("ChunkMonitor", f"💓 Heartbeat: {len(chunk_files)} files found, {len(self.processed_chunks)} processed", "DEBUG")
-                    log_component("ChunkMonitor", f"❤️ Thread alive, is_running={self.is_running}", "DEBUG")
-                    self._last_heartbeat = current_time
-                # Process new chunks
-                for chunk_file in sorted(chunk_files):
-                    chunk_match = re.search(r'chunk_(\d+)_', chunk_file)
-                    if chunk_match:
-                        chunk_id = int(chunk_match.group(1))
-                        
-                        if chunk_id not in self.processed_chunks and os.path.exists(chunk_file):
-                            if self._verify_chunk_ready(chunk_file):
-                                log_component("ChunkMonitor", f"📁 Processing chunk {chunk_id}: {chunk_file}")
-                                self._process_chunk(chunk_file, chunk_id)
-                                self.processed_chunks.add(chunk_id)
-                                self.chunk_count = max(self.chunk_count, chunk_id + 1)
+            last_scan = None
+            
+            while not self._stop_event.is_set():
+                # Events drive processing when the observer is active, backed by a slower
+                # rescan (which also picks up chunks written before monitoring started);
+                # otherwise poll every tick
+                now = time.monotonic()
+                if self._observer is None or last_scan is None or now - last_scan >= FS_EVENT_RESCAN_SECONDS:
+                    chunk_files = self._scan_chunks()
+                    last_scan = now
+                else:
+                    chunk_files = None
+                # Heartbeat logging every 5 seconds (skipped unless ChunkMonitor DEBUG is shown)
+                if is_log_enabled("ChunkMonitor", "DEBUG"):
+                    current_time = time.time()
+                    if not hasattr(self, '_last_heartbeat') or (current_time - self._last_heartbeat) > 5:
+                        found = "event-driven" if chunk_files is None else f"{len(chunk_files)} files found"
+                        log_component("ChunkMonitor", f"💓 Heartbeat: {found}, {self.processed_count} processed, is_running={self.is_running}", "DEBUG")
+                        self._last_heartbeat = current_time
                 
-                # Sleep with Jupyter-compatible approach
-                self._jupyter_safe_sleep(self.check_interval)
+                # Interruptible wait - stop_monitoring() wakes this immediately
+                self._stop_event.wait(timeout=self.check_interval)
                 
             log_component("ChunkMonitor", "🛑 Monitoring loop exited")
             
             # Process any remaining chunks after stopping (same logic as ChunkProcessor)
             log_component("ChunkMonitor", "🔍 Processing any remaining chunks...")
-            chunk_files = glob.glob(f"{self.output_dir}/chunks/chunk_*_{self.chunk_duration}s.mp4")
-            
-            for chunk_file in sorted(chunk_files):
-                chunk_match = re.search(r'chunk_(\d+)_', chunk_file)
-                if chunk_match:
-                    chunk_id = int(chunk_match.group(1))
-                    if chunk_id not in self.processed_chunks and os.path.exists(chunk_file):
-                        if self._verify_chunk_ready(chunk_file, is_final=True):
-                            log_component("ChunkMonitor", f"📁 Final chunk ready: {chunk_file}", "DEBUG")
-                            self._process_chunk(chunk_file, chunk_id)
-                            self.processed_chunks.add(chunk_id)
-                            self.chunk_count = max(self.chunk_count, chunk_id + 1)
+            self._scan_chunks(is_final=True)
             
         except Exception as e:
             log_component("ChunkMonitor", f"❌ Monitoring error: {e}", "ERROR")
             import traceback
             log_component("ChunkMonitor", f"   Traceback: {traceback.format_exc()}", "ERROR")
     
-    def _jupyter_safe_sleep(self, duration):
-        """Sleep in a way that's safe for Jupyter notebooks"""
-        if is_jupyter():
-            # Break sleep into small chunks with I/O operations
-            num_chunks = int(duration / 0.1)
-            for _ in range(num_chunks):
-                time.sleep(0.1)
-                sys.stdout.flush()
-            # Handle remainder
-            remainder = duration - (num_chunks * 0.1)
-            if remainder > 0:
-                time.sleep(remainder)
-                sys.stdout.flush()
+    def _scan_chunks(self, is_final=False):
+        """Glob the chunks directory and process every ready, unprocessed chunk"""
+        search_pattern = f"{self.output_dir}/chunks/chunk_*_{self.chunk_duration}s.mp4"
+        chunk_files = glob.glob(search_pattern)
+        
+        pending = []
+        for chunk_file in sorted(chunk_files):
+            chunk_match = self._chunk_pattern.search(chunk_file)
+            if chunk_match and not self._is_processed(int(chunk_match.group(1))):
+                pending.append(chunk_file)
+        
+        # Probe a backlog in parallel; subprocess waits release the GIL
+        probed = len(pending) > 1 and self._probe_pool is not None
+        if probed:
+            durations = list(self._probe_pool.map(self._probe_duration, pending))
         else:
-            time.sleep(duration)
+            durations = [None] * len(pending)
+        
+        for chunk_file, duration in zip(pending, durations):
+            if probed and duration is None:
+                continue  # Not readable yet, retry on the next scan
+            self._handle_chunk_file(chunk_file, is_final=is_final, duration=duration)
+        return chunk_files
     
-    def _verify_chunk_ready(self, file_path, is_final=False):
-        """Verify chunk is ready by checking file stability and duration"""
-        if not os.path.exists(file_path):
+    def _handle_chunk_file(self, chunk_file, is_final=False, duration=None):
+        """Process a single chunk file if it is new and ready (called from polling and event threads)"""
+        chunk_match = self._chunk_pattern.search(chunk_file)
+        if not chunk_match:
             return False
+        chunk_id = int(chunk_match.group(1))
         
+        with self._process_lock:
+            if self._is_processed(chunk_id) or not os.path.exists(chunk_file):
+                return False
+            if not self._verify_chunk_ready(chunk_file, is_final=is_final, duration=duration):
+                return False
+            
+            if is_final:
+                log_component("ChunkMonitor", f"📁 Final chunk ready: {chunk_file}", "DEBUG")
+            else:
+                log_component("ChunkMonitor", f"📁 Processing chunk {chunk_id}: {chunk_file}")
+            # Mark before submitting so the chunk is never queued twice
+            self._mark_processed(chunk_id)
+            self.chunk_count = max(self.chunk_count, chunk_id + 1)
+            self.last_chunk_time = time.time()
+        
+        self._worker_pool.submit(self._process_chunk, chunk_file, chunk_id)
+        return True
+    
+    def _is_processed(self, chunk_id):
+        """Check whether a chunk ID has already been processed"""
+        return chunk_id < self._next_unprocessed or chunk_id in self._out_of_order
+    
+    def _mark_processed(self, chunk_id):
+        """Record a processed chunk ID, advancing the watermark over any contiguous run"""
+        self.processed_count += 1
+        if chunk_id != self._next_unprocessed:
+            self._out_of_order.add(chunk_id)
+            return
+        self._next_unprocessed += 1
+        while self._next_unprocessed in self._out_of_order:
+            self._out_of_order.remove(self._next_unprocessed)
+            self._next_unprocessed += 1
+    
+    def _probe_duration(self, file_path):
+        """Return the chunk duration from ffprobe, or None if the file is not readable yet"""
         try:
             # Check minimum file size
-            if os.path.getsize(file_path) < 50000:
-                return False
+            if not os.path.exists(file_path) or os.path.getsize(file_path) < 50000:
+                return None
             
             # Use ffprobe to check if file is readable and get duration
             probe_cmd = ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', file_path]
             probe_result = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=5)
             
             if probe_result.returncode != 0:
-                return False
+                return None
             
             # Parse duration from ffprobe output
             probe_data = json.loads(probe_result.stdout)
-            duration = float(probe_data.get('format', {}).get('duration', 0))
-            
+            return float(probe_data.get('format', {}).get('duration', 0))
+        
+        except Exception as e:
+            log_component("ChunkMonitor", f"⚠️ Error verifying chunk: {e}", "WARNING")
+            return None
+    
+    def _verify_chunk_ready(self, file_path, is_final=False, duration=None):
+        """Verify chunk is ready by checking file stability and duration"""
+        if duration is None:
+            duration = self._probe_duration(file_path)
+            if duration is None:
+                return False
+        
+        debug = is_log_enabled("ChunkMonitor", "DEBUG")
+        try:
             if is_final:
                 # For final chunks, accept any reasonable duration (minimum 1 second)
                 if duration >= 1.0:
-                    log_component("ChunkMonitor", f"✅ Final chunk ready: duration {duration:.1f}s", "DEBUG")
+                    if debug:
+                        log_component("ChunkMonitor", f"✅ Final chunk ready: duration {duration:.1f}s", "DEBUG")
                     return True
                 else:
-                    log_component("ChunkMonitor", f"⏳ Final chunk too short: {duration:.1f}s", "DEBUG")
+                    if debug:
+                        log_component("ChunkMonitor", f"⏳ Final chunk too short: {duration:.1f}s", "DEBUG")
                     return False
             else:
                 # For regular chunks, check if duration matches expected
@@ -230,10 +353,12 @@ class ChunkMonitor:
                 duration_diff = abs(duration - expected_duration)
                 
                 if duration_diff <= 1.0:  # Allow 1 second tolerance
-                    log_component("ChunkMonitor", f"✅ Chunk ready: duration {duration:.1f}s (expected {expected_duration}s)", "DEBUG")
+                    if debug:
+                        log_component("ChunkMonitor", f"✅ Chunk ready: duration {duration:.1f}s (expected {expected_duration}s)", "DEBUG")
                     return True
                 else:
-                    log_component("ChunkMonitor", f"⏳ Chunk duration {duration:.1f}s, waiting for {expected_duration}s", "DEBUG")
+                    if debug:
+                        log_component("ChunkMonitor", f"⏳ Chunk duration {duration:.1f}s, waiting for {expected_duration}s", "DEBUG")
                     return False
         
         except Exception as e:
@@ -275,15 +400,30 @@ class ChunkMonitor:
     def stop_monitoring(self):
         """Stop monitoring"""
         self.is_running = False
+        self._stop_event.set()
         log_component("ChunkMonitor", "🛑 Stopping chunk monitoring...", "DEBUG")
         
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+        
         if hasattr(self, 'monitor_thread') and self.monitor_thread.is_alive():
             log_component("ChunkMonitor", "   ⏳ Waiting for monitor thread...")
             self.monitor_thread.join(timeout=5)
             if self.monitor_thread.is_alive():
-                log_component("ChunkMonitor", "   ⚠️ Thread still running (daemon will exit)", "WARNING")
-            else:
-                log_component("ChunkMonitor", "   ✅ Thread stopped")
+                # The final scan still submits to the pools below, so they can't be shut down yet
+                log_component("ChunkMonitor", "   ⏳ Final scan still running, waiting for it to finish...", "WARNING")
+                self.monitor_thread.join()
+            log_component("ChunkMonitor", "   ✅ Thread stopped")
+        
+        # Let in-flight filmstrips finish and queue their analyses
+        if self._worker_pool is not None:
+            self._worker_pool.shutdown(wait=True)
+            self._worker_pool = None
+        if self._probe_pool is not None:
+            self._probe_pool.shutdown(wait=True)
+            self._probe_pool = None
         
         log_component("ChunkMonitor", f"🛑 Monitoring stopped ({self.chunk_count} chunks processed)", "DEBUG")
     
@@ -292,7 +432,7 @@ class ChunkMonitor:
         return {
             'is_running': self.is_running,
             'chunk_count': self.chunk_count,
-            'processed_chunks': len(self.processed_chunks),
+            'processed_chunks': self.processed_count,
             'thread_alive': hasattr(self, 'monitor_thread') and self.monitor_thread.is_alive()
         }
 
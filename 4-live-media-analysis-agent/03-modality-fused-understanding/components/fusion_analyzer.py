@@ -863,7 +863,9 @@ AUDIO INSIGHTS FOR CONTENT ANALYSIS:
         relevant_sentences = []
         relevant_sentences_json = []
         
-        for sentence_data in sentence_buffer:
+        # Iterate a snapshot: the transcription handler appends to the buffer from its own task,
+        # and a bounded deque raises if it is mutated during iteration
+        for sentence_data in list(sentence_buffer):
             sentence_start = sentence_data.get('start_time', 0)
             sentence_end = sentence_data.get('end_time', 0)
             
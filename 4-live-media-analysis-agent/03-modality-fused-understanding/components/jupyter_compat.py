@@ -3,23 +3,23 @@ Jupyter Notebook Compatibility Utilities
 Handles threading issues specific to Jupyter environments
 """
 
-import sys
+import logging
 import threading
 import time
 
-# Import logging from shared component monitor
-import os
-from pathlib import Path
+# Import logging from shared component monitor (the notebook puts the project root on sys.path)
+try:
+    from src.shared import log_component, is_log_enabled
+except ImportError:
+    def log_component(component, message, level="INFO"):
+        print(f"[{component}] {message}")
+    
+    def is_log_enabled(component, level="DEBUG"):
+        return True
 
-# Add parent directory to path to import from src.shared
-current_dir = Path(__file__).parent
-project_root = current_dir.parent.parent
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
+_log = logging.getLogger(__name__)
 
-from src.shared.component_monitor import log_component
-
-def is_jupyter():
+def _detect_jupyter():
     """Check if running in Jupyter notebook"""
     try:
         from IPython import get_ipython
@@ -29,24 +29,31 @@ def is_jupyter():
         pass
     return False
 
+# The environment can't change within a process, so detect it once
+_IS_JUPYTER = _detect_jupyter()
+
+def is_jupyter():
+    """Check if running in Jupyter notebook"""
+    return _IS_JUPYTER
+
 def ensure_thread_alive(thread, name="Thread", check_interval=5):
     """
     Monitor a thread and log if it dies unexpectedly.
     This is a debugging utility for Jupyter threading issues.
     
+    The thread is registered with the global thread manager's shared
+    watchdog rather than getting a dedicated monitor thread.
+    
     Args:
         thread: The thread to monitor
         name: Name for logging
-        check_interval: How often to check (seconds)
+        check_interval: How often to check (seconds); only applies if the
+            watchdog is not already running
+    
+    Returns:
+        threading.Thread: The shared watchdog thread
     """
-    def monitor():
-        while thread.is_alive():
-            time.sleep(check_interval)
-        log_component("JupyterCompat", f"{name} has stopped!", "WARNING")
-    
-    monitor_thread = threading.Thread(target=monitor, daemon=True)
-    monitor_thread.start()
-    return monitor_thread
+    return get_thread_manager().watch_thread(thread, name, check_interval)
 
 def create_daemon_thread(target, name=None, args=(), kwargs=None):
     """
@@ -77,7 +84,8 @@ def create_daemon_thread(target, name=None, args=(), kwargs=None):
     
     # In Jupyter, we want to ensure threads are tracked
     if is_jupyter():
-        log_component("JupyterCompat", f"Creating Jupyter-compatible thread: {name or 'unnamed'}", "DEBUG")
+        if is_log_enabled("JupyterCompat", "DEBUG"):
+            log_component("JupyterCompat", f"Creating Jupyter-compatible thread: {name or 'unnamed'}", "DEBUG")
     
     return thread
 
@@ -94,19 +102,24 @@ def keep_thread_alive_wrapper(func):
                 pass
     """
     def wrapper(*args, **kwargs):
-        if is_jupyter():
-            log_component("JupyterCompat", f"Thread {threading.current_thread().name} starting with keep-alive wrapper", "DEBUG")
+        log = log_component
+        thread_name = threading.current_thread().name
+        in_jupyter = _IS_JUPYTER
+        
+        debug_on = in_jupyter and is_log_enabled("JupyterCompat", "DEBUG")
+        
+        if debug_on:
+            log("JupyterCompat", f"Thread {thread_name} starting with keep-alive wrapper", "DEBUG")
         
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            log_component("JupyterCompat", f"Thread {threading.current_thread().name} crashed: {e}", "ERROR")
-            import traceback
-            traceback.print_exc()
+            log("JupyterCompat", f"Thread {thread_name} crashed: {e}", "ERROR")
+            _log.exception("Thread %s crashed", thread_name)
             raise
         finally:
-            if is_jupyter():
-                log_component("JupyterCompat", f"Thread {threading.current_thread().name} exiting", "DEBUG")
+            if debug_on:
+                log("JupyterCompat", f"Thread {thread_name} exiting", "DEBUG")
     
     return wrapper
 
@@ -123,9 +136,16 @@ class JupyterThreadManager:
         manager.print_status()
     """
     
-    def __init__(self):
+    def __init__(self, check_interval=5):
         self.threads = {}
         self.is_jupyter = is_jupyter()
+        self.check_interval = check_interval
+        
+        # A single watchdog thread checks every watched thread (thread -> name, so
+        # threads sharing a name are each reported)
+        self._watched = {}
+        self._watchdog_thread = None
+        self._watch_lock = threading.Lock()
         
         if self.is_jupyter:
             log_component("JupyterCompat", "JupyterThreadManager initialized for Jupyter environment", "DEBUG")
@@ -145,10 +165,45 @@ class JupyterThreadManager:
         
         if self.is_jupyter and name:
             # Add monitoring in Jupyter
-            ensure_thread_alive(thread, name)
+            self.watch_thread(thread, name)
         
         return thread
     
+    def watch_thread(self, thread, name, check_interval=None):
+        """
+        Register a thread with the shared watchdog, starting it if needed.
+        
+        check_interval only takes effect when this call starts the watchdog.
+        """
+        with self._watch_lock:
+            self._watched[thread] = name
+            if self._watchdog_thread is None:
+                if check_interval is not None:
+                    self.check_interval = check_interval
+                self._watchdog_thread = threading.Thread(
+                    target=self._watchdog_loop,
+                    name="JupyterCompat-Watchdog",
+                    daemon=True
+                )
+                self._watchdog_thread.start()
+            return self._watchdog_thread
+    
+    def _watchdog_loop(self):
+        """Log each watched thread once when it stops; exit when none are left"""
+        while True:
+            time.sleep(self.check_interval)
+            with self._watch_lock:
+                stopped = [thread for thread in self._watched if not thread.is_alive()]
+                stopped_names = [self._watched.pop(thread) for thread in stopped]
+                idle = not self._watched
+                if idle:
+                    self._watchdog_thread = None
+            
+            for name in stopped_names:
+                log_component("JupyterCompat", f"{name} has stopped!", "WARNING")
+            if idle:
+                return
+    
     def print_status(self):
         """Print status of all managed threads"""
         log_component("JupyterCompat", "=" * 60, "DEBUG")
@@ -167,12 +222,10 @@ class JupyterThreadManager:
         self.print_status()
 
 
-# Global thread manager instance
-_thread_manager = None
+# Global thread manager instance, created at import so concurrent first
+# callers can't each build (and lose) their own manager
+_thread_manager = JupyterThreadManager()
 
 def get_thread_manager():
-    """Get or create global thread manager"""
-    global _thread_manager
-    if _thread_manager is None:
-        _thread_manager = JupyterThreadManager()
+    """Get the global thread manager"""
     return _thread_manager
@@ -6,9 +6,11 @@ for multi-modal fusion processing.
 """
 
 import asyncio
-import time
 from typing import Callable, Optional
 
+# Seconds between chapter table refreshes while processing
+REFRESH_INTERVAL = 15
+
 
 class ProcessingUtils:
     """Utility class for processing orchestration"""
@@ -63,32 +65,38 @@ class ProcessingUtils:
 
             # Initialize stream monitor for centralized stream-end detection
             stream_monitor = stream_monitor_class(chunk_monitor, transcription_processor)
+            loop = asyncio.get_running_loop()
             
-            # Monitor for duration timeout OR stream end
+            # Monitor for duration timeout OR stream end - both just set stop_event
             log_component("Main", f"⏳ Processing for {duration_minutes} minutes (or until stream ends)...", "DEBUG")
-            start_time = time.time()
-            last_refresh_time = time.time()
+            stop_event = asyncio.Event()
+            stream_monitor.start_watching(loop, stop_event)
+            duration_handle = loop.call_later(duration_minutes * 60, stop_event.set)
             
-            # Refresh table immediately on first load
+            # Refresh table immediately on first load, then on a self-rescheduling timer
             refresh_chapter_table()
+            refresh_handle = None
             
-            while True:
-                # Check duration timeout
-                if time.time() - start_time >= duration_minutes * 60:
-                    log_component("Main", f"🛑 Duration elapsed ({duration_minutes} minutes), stopping processors...")
-                    break
-                    
-                # Check stream end
-                if stream_monitor.stream_appears_ended():
-                    log_component("Main", "📡 Stream appears to have ended (60s timeout), stopping processors...")
-                    break
-                
-                # Refresh display every 15 seconds
-                if time.time() - last_refresh_time >= 15:
+            def _refresh_tick():
+                nonlocal refresh_handle
+                try:
                     refresh_chapter_table()
-                    last_refresh_time = time.time()
-                    
-                await asyncio.sleep(1)
+                finally:
+                    refresh_handle = loop.call_later(REFRESH_INTERVAL, _refresh_tick)
+            
+            refresh_handle = loop.call_later(REFRESH_INTERVAL, _refresh_tick)
+            
+            await stop_event.wait()
+            
+            duration_elapsed = loop.time() >= duration_handle.when()
+            duration_handle.cancel()
+            refresh_handle.cancel()
+            stream_monitor.stop_watching()
+            
+            if duration_elapsed:
+                log_component("Main", f"🛑 Duration elapsed ({duration_minutes} minutes), stopping processors...")
+            else:
+                log_component("Main", "📡 Stream appears to have ended (60s timeout), stopping processors...")
 
             # Shutdown sequence
             await ProcessingUtils._shutdown_processors(
@@ -122,46 +130,18 @@ class ProcessingUtils:
     ):
         """Handle graceful shutdown of all processors"""
         
-        # 1. Stop data sources (no new data flowing in)
-        log_component("Main", "🛑 Stopping recording manager...")
-        recording_manager.stop_recording()
-
-        log_component("Main", "🛑 Stopping transcription...")
-        await transcription_processor.stop_transcription()
-
-        # 2. Stop chunk monitor (no new filmstrips/analyses queued)
-        log_component("Main", "🛑 Stopping chunk monitor...")
-        chunk_monitor.stop_monitoring()
-
-        # 3. Stop chunk processor (FFmpeg)
-        log_component("Main", "🛑 Stopping chunk processor...")
-        chunk_processor.stop_processing()
-
-        # 4. Brief pause for any in-flight operations
-        log_component("Main", "⏳ Waiting for in-flight operations...", "DEBUG")
-        time.sleep(2)
-
-        # 5. Stop fusion analyzer (process remaining queue)
-        log_component("Main", "🛑 Stopping fusion analyzer...")
-        fusion_analyzer.stop_analysis()
-
-        # 6. Final chapter table refresh (show all chapters including last one)
-        log_component("Main", "📊 Final chapter table refresh...")
-        refresh_chapter_table()
-
-        # 7. Generate final summary of all content
-        log_component("Main", "📝 Generating final content summary...")
-        fusion_analyzer.generate_final_summary()
-        
-        # 8. Wait for all clip creation to complete
-        fusion_analyzer.wait_for_clip_creation()
-        
-        # 9. Final table refresh after all clips are created
-        log_component("Main", "📊 Final table refresh - all processing complete")
-        refresh_chapter_table()
-        
-        # Wait for transcription task to complete
-        if transcription_task:
+        # 1. Stop data sources (no new data flowing in) - independent, so overlap them
+        log_component("Main", "🛑 Stopping recording manager and transcription...")
+        await asyncio.gather(
+            asyncio.to_thread(recording_manager.stop_recording),
+            transcription_processor.stop_transcription()
+        )
+
+        # The transcription task only needs stop_transcription() to have run,
+        # so drain it alongside the processor/analyzer legs below
+        async def _await_transcription_task():
+            if not transcription_task:
+                return
             try:
                 await asyncio.wait_for(transcription_task, timeout=10)
             except asyncio.TimeoutError:
@@ -171,6 +151,38 @@ class ProcessingUtils:
                 except asyncio.CancelledError:
                     pass
 
+        async def _drain_pipeline():
+            # 2. Stop chunk monitor and chunk processor (FFmpeg) - independent of each other
+            log_component("Main", "🛑 Stopping chunk monitor and chunk processor...")
+            await asyncio.gather(
+                asyncio.to_thread(chunk_monitor.stop_monitoring),
+                asyncio.to_thread(chunk_processor.stop_processing)
+            )
+
+            # 3. Brief pause for any in-flight operations
+            log_component("Main", "⏳ Waiting for in-flight operations...", "DEBUG")
+            await asyncio.sleep(2)
+
+            # 4. Stop fusion analyzer (process remaining queue, finalize chapters)
+            log_component("Main", "🛑 Stopping fusion analyzer...")
+            await asyncio.to_thread(fusion_analyzer.stop_analysis)
+
+            # 5. Final chapter table refresh (show all chapters including last one)
+            log_component("Main", "📊 Final chapter table refresh...")
+            refresh_chapter_table()
+
+            # 6. Generate final summary while clip creation finishes in the background
+            log_component("Main", "📝 Generating final content summary...")
+            await asyncio.gather(
+                asyncio.to_thread(fusion_analyzer.generate_final_summary),
+                asyncio.to_thread(fusion_analyzer.wait_for_clip_creation)
+            )
+
+            # 7. Final table refresh after all clips are created
+            log_component("Main", "📊 Final table refresh - all processing complete")
+            refresh_chapter_table()
+
+        await asyncio.gather(_drain_pipeline(), _await_transcription_task())
 
 # Convenience function for direct import
 async def start_fusion_processing(
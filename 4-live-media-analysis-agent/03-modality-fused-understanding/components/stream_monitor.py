@@ -3,6 +3,7 @@ Stream Monitor - Centralized stream-end detection
 Module-specific component for Modality Fusion Understanding
 """
 
+import asyncio
 import time
 
 # Import shared components
@@ -45,6 +46,9 @@ class StreamMonitor:
         self.last_activity_time = time.time()
         self.last_chunk_count = 0
         self.transcription_was_running = False  # Track if transcription was ever running
+        self.stream_end_event = None
+        self._loop = None
+        self._timer = None
         
     def update_activity(self):
         """
@@ -55,10 +59,11 @@ class StreamMonitor:
         """
         current_time = time.time()
         
-        # Check if new chunks are being processed
+        # Check if new chunks are being processed; date the activity from when the
+        # producer saw the chunk, not from when it was sampled here
         current_chunk_count = getattr(self.chunk_processor, 'chunk_count', 0)
         if current_chunk_count > self.last_chunk_count:
-            self.last_activity_time = current_time
+            self.last_activity_time = getattr(self.chunk_processor, 'last_chunk_time', None) or current_time
             self.last_chunk_count = current_chunk_count
             return True
             
@@ -91,6 +96,42 @@ class StreamMonitor:
         time_since_activity = time.time() - self.last_activity_time
         return time_since_activity >= self.stream_timeout
     
+    def start_watching(self, loop=None, stream_end_event=None):
+        """
+        Arm an inactivity timer on the asyncio loop instead of being polled.
+        
+        The timer fires when the stream timeout would elapse since the last
+        observed activity and re-arms itself while the stream is still active.
+        
+        Args:
+            loop: Event loop to schedule on (defaults to the running loop)
+            stream_end_event: Optional existing asyncio.Event to set on stream end
+        
+        Returns:
+            asyncio.Event: Set once the stream appears to have ended
+        """
+        self._loop = loop or asyncio.get_running_loop()
+        self.stream_end_event = stream_end_event or asyncio.Event()
+        self._arm_timer()
+        return self.stream_end_event
+    
+    def stop_watching(self):
+        """Cancel the inactivity timer"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+    
+    def _arm_timer(self):
+        delay = max(0.0, self.last_activity_time + self.stream_timeout - time.time())
+        self._timer = self._loop.call_later(delay, self._check_stream_end)
+    
+    def _check_stream_end(self):
+        if self.stream_appears_ended():
+            self._timer = None
+            self.stream_end_event.set()
+        else:
+            self._arm_timer()
+    
     def get_status(self):
         """
         Get current stream status information.
@@ -3,9 +3,13 @@
 Viewing Companion Agent for AgentCore Runtime
 Provides real-time video understanding with memory and summarization
 """
+import asyncio
 import json
 import logging
+import time
 import boto3
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 
 from strands import Agent, tool
@@ -20,34 +24,64 @@ app = BedrockAgentCoreApp()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize AWS clients
-ssm_client = boto3.client('ssm')
-agentcore_client = boto3.client('bedrock-agentcore')
-bedrock_agent_runtime = boto3.client('bedrock-agent-runtime')
+# Initialize AWS clients - fail fast instead of waiting out boto3's multi-minute defaults
+CLIENT_CONFIG = Config(
+    connect_timeout=2,
+    read_timeout=15,
+    retries={'max_attempts': 2, 'mode': 'adaptive'}
+)
+ssm_client = boto3.client('ssm', config=CLIENT_CONFIG)
+agentcore_client = boto3.client('bedrock-agentcore', config=CLIENT_CONFIG)
+bedrock_agent_runtime = boto3.client('bedrock-agent-runtime', config=CLIENT_CONFIG)
+
+# Longest gap allowed between two stream events (covers tool calls) before giving up
+STREAM_EVENT_TIMEOUT_SECONDS = 30
+
+
+# In-process cache of SSM parameter values keyed by parameter name
+_ssm_cache: Dict[str, str] = {}
+
+
+def get_ssm_parameters(parameter_names: List[str]) -> Dict[str, str]:
+    """Get parameter values from AWS Systems Manager Parameter Store in one call (up to 10 names)."""
+    missing = [name for name in parameter_names if name not in _ssm_cache]
+    if missing:
+        try:
+            response = ssm_client.get_parameters(
+                Names=missing,
+                WithDecryption=True
+            )
+            for parameter in response['Parameters']:
+                _ssm_cache[parameter['Name']] = parameter['Value']
+            for name in response.get('InvalidParameters', []):
+                logger.error("Error getting SSM parameter %s: parameter not found", name)
+        except Exception as e:
+            logger.error("Error getting SSM parameters %s: %s", missing, e)
+    return {name: _ssm_cache.get(name) for name in parameter_names}
 
 
 def get_ssm_parameter(parameter_name: str) -> str:
     """Get parameter value from AWS Systems Manager Parameter Store."""
-    try:
-        response = ssm_client.get_parameter(
-            Name=parameter_name,
-            WithDecryption=True
-        )
-        return response['Parameter']['Value']
-    except Exception as e:
-        logger.error(f"Error getting SSM parameter {parameter_name}: {e}")
-        return None
+    return get_ssm_parameters([parameter_name])[parameter_name]
 
 
 # Load configuration from SSM Parameter Store
-MODEL_ID = get_ssm_parameter("/viewing-companion/model_id")
-MEMORY_ID = get_ssm_parameter("/viewing-companion/memory_id")
-ACTOR_ID = get_ssm_parameter("/viewing-companion/actor_id")
-SESSION_ID = get_ssm_parameter("/viewing-companion/session_id")
-ROLLING_SUMMARY_NAMESPACE = get_ssm_parameter("/viewing-companion/rolling_summary_namespace")
-KB_ID = get_ssm_parameter("/viewing-companion/kb_id")
+_config = get_ssm_parameters([
+    "/viewing-companion/model_id",
+    "/viewing-companion/memory_id",
+    "/viewing-companion/actor_id",
+    "/viewing-companion/session_id",
+    "/viewing-companion/rolling_summary_namespace",
+    "/viewing-companion/kb_id",
+])
+MODEL_ID = _config["/viewing-companion/model_id"]
+MEMORY_ID = _config["/viewing-companion/memory_id"]
+ACTOR_ID = _config["/viewing-companion/actor_id"]
+SESSION_ID = _config["/viewing-companion/session_id"]
+ROLLING_SUMMARY_NAMESPACE = _config["/viewing-companion/rolling_summary_namespace"]
+KB_ID = _config["/viewing-companion/kb_id"]
 
-logger.info(f"Configuration loaded - Memory: {MEMORY_ID}, KB: {KB_ID}")
+logger.info("Configuration loaded - Memory: %s, KB: %s", MEMORY_ID, KB_ID)
 
 
 # System prompt
@@ -62,58 +96,105 @@ Guideline:
 """
 
 
+# Model is built once per process and shared by every request's agent
+MODEL = BedrockModel(model_id=MODEL_ID, temperature=0.3) if MODEL_ID else None
+
+# Bursts of user turns share one list_events fetch
+EVENT_CACHE_TTL_SECONDS = 3.0
+_latest_event_cache: Dict[tuple, tuple] = {}
+
+
+def get_latest_event():
+    """Get the latest short-term memory event, reusing a fetch made within the TTL."""
+    key = (MEMORY_ID, ACTOR_ID, SESSION_ID)
+    now = time.monotonic()
+    cached = _latest_event_cache.get(key)
+    if cached and now - cached[0] < EVENT_CACHE_TTL_SECONDS:
+        return cached[1]
+    
+    events_resp = agentcore_client.list_events(
+        memoryId=MEMORY_ID,
+        actorId=ACTOR_ID,
+        sessionId=SESSION_ID,
+        maxResults=1,
+        includePayloads=True
+    )
+    latest_event = events_resp['events'][0] if events_resp.get('events') else None
+    _latest_event_cache[key] = (now, latest_event)
+    return latest_event
+
+
+# Prompt suffix built from the latest event, reused while fresh: key -> (built_at, suffix)
+_memory_context_cache: Dict[tuple, tuple] = {}
+
+
+def _build_memory_context(latest_event) -> str:
+    """Render the latest event and its metadata as a system prompt suffix."""
+    if not latest_event:
+        return ""
+    
+    # Extract event content
+    events = []
+    for payload in latest_event.get('payload', []):
+        conv = payload.get('conversational')
+        if conv:
+            text = (conv.get('content') or {}).get('text', '')
+            events.append(f"{conv.get('role')}: {text}")
+    
+    # Extract metadata
+    metadata = latest_event.get('metadata') or {}
+    mget = metadata.get
+    title, genre, start_ms, end_ms = mget('title'), mget('genre'), mget('start_ms'), mget('end_ms')
+    metadata_info = []
+    if title is not None:
+        metadata_info.append(f"Show: {title.get('stringValue', '')}")
+    if genre is not None:
+        metadata_info.append(f"Genre: {genre.get('stringValue', '')}")
+    if start_ms is not None and end_ms is not None:
+        metadata_info.append(f"Timestamp: {start_ms.get('stringValue', '0')}ms - {end_ms.get('stringValue', '0')}ms")
+    
+    # Build context
+    context_parts = []
+    if metadata_info:
+        context_parts.append("Show Information:\n" + "\n".join(metadata_info))
+    if events:
+        context_parts.append("\nMost Recent Event:\n" + "\n".join(events))
+    
+    return "\n\n" + "\n\n".join(context_parts) if context_parts else ""
+
+
+def get_memory_context() -> str:
+    """Get the system prompt suffix for the latest event, rebuilding it only once the TTL expires."""
+    key = (MEMORY_ID, ACTOR_ID, SESSION_ID)
+    now = time.monotonic()
+    cached = _memory_context_cache.get(key)
+    if cached and now - cached[0] < EVENT_CACHE_TTL_SECONDS:
+        return cached[1]
+    
+    suffix = _build_memory_context(get_latest_event())
+    _memory_context_cache[key] = (now, suffix)
+    return suffix
+
+
 # Memory Hook to load recent events
 class MemoryHook(HookProvider):
     def on_agent_initialized(self, event: AgentInitializedEvent):
         """Load recent events and metadata from short-term memory"""
         try:
-            events_resp = agentcore_client.list_events(
-                memoryId=MEMORY_ID,
-                actorId=ACTOR_ID,
-                sessionId=SESSION_ID,
-                maxResults=1,
-                includePayloads=True
-            )
-            
-            if events_resp.get('events'):
-                latest_event = events_resp['events'][0]
-                
-                # Extract event content
-                events = []
-                for payload in latest_event.get('payload', []):
-                    if 'conversational' in payload:
-                        conv = payload['conversational']
-                        events.append(f"{conv.get('role')}: {conv.get('content', {}).get('text', '')}")
-                
-                # Extract metadata
-                metadata = latest_event.get('metadata', {})
-                metadata_info = []
-                if 'title' in metadata:
-                    metadata_info.append(f"Show: {metadata['title'].get('stringValue', '')}")
-                if 'genre' in metadata:
-                    metadata_info.append(f"Genre: {metadata['genre'].get('stringValue', '')}")
-                if 'start_ms' in metadata and 'end_ms' in metadata:
-                    start = metadata['start_ms'].get('stringValue', '0')
-                    end = metadata['end_ms'].get('stringValue', '0')
-                    metadata_info.append(f"Timestamp: {start}ms - {end}ms")
-                
-                # Build context
-                context_parts = []
-                if metadata_info:
-                    context_parts.append("Show Information:\n" + "\n".join(metadata_info))
-                if events:
-                    context_parts.append("\nMost Recent Event:\n" + "\n".join(events))
-                
-                if context_parts:
-                    event.agent.system_prompt += "\n\n" + "\n\n".join(context_parts)
-                
+            suffix = get_memory_context()
+            if suffix:
+                event.agent.system_prompt = f"{SYSTEM_PROMPT}{suffix}"
         except Exception as e:
-            logger.error(f"Memory load error: {e}")
+            logger.error("Memory load error: %s", e)
     
     def register_hooks(self, registry: HookRegistry):
         registry.add_callback(AgentInitializedEvent, self.on_agent_initialized)
 
 
+# Shared by every request's agent; it holds no per-request state
+MEMORY_HOOK = MemoryHook()
+
+
 # Tool definitions
 @tool
 def get_show_summary() -> str:
@@ -122,26 +203,23 @@ def get_show_summary() -> str:
     Use this when users ask about show content, current topics, or what they've missed.
     """
     try:
-        # Get latest summary from memory records
-        summary_resp = agentcore_client.list_memory_records(
-            memoryId=MEMORY_ID,
-            namespace=ROLLING_SUMMARY_NAMESPACE,
-            maxResults=1
-        )
-        summary = summary_resp['memoryRecordSummaries'][0]['content']['text'] if summary_resp.get('memoryRecordSummaries') else ""
+        # Fetch the latest summary record and latest event concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            summary_future = executor.submit(
+                agentcore_client.list_memory_records,
+                memoryId=MEMORY_ID,
+                namespace=ROLLING_SUMMARY_NAMESPACE,
+                maxResults=1
+            )
+            event_future = executor.submit(get_latest_event)
+            summary_resp = summary_future.result()
+            event = event_future.result()
         
-        # Get latest event
-        events_resp = agentcore_client.list_events(
-            memoryId=MEMORY_ID,
-            actorId=ACTOR_ID,
-            sessionId=SESSION_ID,
-            maxResults=1,
-            includePayloads=True
-        )
+        summary = summary_resp['memoryRecordSummaries'][0]['content']['text'] if summary_resp.get('memoryRecordSummaries') else ""
         
         latest_event = ""
-        if events_resp.get('events'):
-            for payload in events_resp['events'][0].get('payload', []):
+        if event:
+            for payload in event.get('payload', []):
                 if 'conversational' in payload:
                     latest_event = payload['conversational']['content']['text']
         
@@ -155,7 +233,7 @@ def get_show_summary() -> str:
         return "\n\n".join(context) if context else "No show information available yet."
         
     except Exception as e:
-        logger.error(f"Error in get_show_summary: {e}")
+        logger.error("Error in get_show_summary: %s", e)
         return f"Unable to retrieve show summary: {str(e)}"
 
 
@@ -184,7 +262,7 @@ def search_key_moments(query: str, max_results: int = 2) -> List[Dict]:
         
         results = []
         for result in response['retrievalResults']:
-            metadata = result.get('metadata', {})
+            metadata = result.get('metadata') or {}
             results.append({
                 'content': result['content']['text'],
                 'start_ms': metadata.get('start_ms', 0),
@@ -193,10 +271,13 @@ def search_key_moments(query: str, max_results: int = 2) -> List[Dict]:
         
         return results
     except Exception as e:
-        logger.error(f"Error in search_key_moments: {e}")
+        logger.error("Error in search_key_moments: %s", e)
         return [{"error": f"Unable to search key moments: {str(e)}"}]
 
 
+TOOLS = [get_show_summary, search_key_moments]
+
+
 @app.entrypoint
 async def invoke(payload, context=None):
     """
@@ -217,30 +298,36 @@ async def invoke(payload, context=None):
             yield "Error: Missing required SSM parameters"
             return
         
-        logger.info(f"Processing request - Memory: {MEMORY_ID}, KB: {KB_ID}")
-        
-        # Initialize model
-        model = BedrockModel(model_id=MODEL_ID, temperature=0.3)
-        
-        # Create agent with memory hook and tools
+        # Create a per-request agent (conversation state is not shared) around the shared model
         agent = Agent(
-            model=model,
+            model=MODEL,
             system_prompt=SYSTEM_PROMPT,
-            tools=[get_show_summary, search_key_moments],
-            hooks=[MemoryHook()]
+            tools=TOOLS,
+            hooks=[MEMORY_HOOK]
         )
         
         # Stream the response
-        stream = agent.stream_async(user_input)
+        stream = agent.stream_async(user_input).__aiter__()
         
-        async for event in stream:
-            # Stream regular text data
+        while True:
+            try:
+                event = await asyncio.wait_for(stream.__anext__(), timeout=STREAM_EVENT_TIMEOUT_SECONDS)
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                logger.error("Agent stream stalled for %ss, aborting request", STREAM_EVENT_TIMEOUT_SECONDS)
+                yield "Error: Timed out waiting for the model response"
+                break
+            
+            # Stream regular text data - the common case, so skip everything else
             if "data" in event:
                 yield event["data"]
+                continue
             
             # Include tool usage information for transparency (optional)
-            if "message" in event and "content" in event["message"]:
-                for content_item in event['message']['content']:
+            content = event.get("message", {}).get("content")
+            if content:
+                for content_item in content:
                     if "toolUse" in content_item:
                         tool_name = content_item["toolUse"].get("name", "Unknown")
                         # Optionally yield tool call information
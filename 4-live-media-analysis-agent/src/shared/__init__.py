@@ -15,6 +15,7 @@ from .component_monitor import (
     ComponentMonitor,
     LogLevel,
     log_component,
+    is_log_enabled,
     set_debug_logging,
     set_component_logging_level,
     show_component_table,
@@ -42,6 +43,7 @@ __all__ = [
     'ComponentMonitor',
     'LogLevel',
     'log_component',
+    'is_log_enabled',
     'set_debug_logging',
     'set_component_logging_level',
     'show_component_table',
@@ -3,9 +3,12 @@ Component Activity Monitor for Multimodal Fusion System
 Enhanced stdout approach with visual formatting and comprehensive log level control
 """
 
+import atexit
+import queue
+import sys
 import threading
-from datetime import datetime
-from collections import defaultdict
+import time
+from collections import deque
 from enum import IntEnum
 
 class LogLevel(IntEnum):
@@ -17,13 +20,37 @@ class LogLevel(IntEnum):
     CRITICAL = 4
     DISABLED = 5
 
+# Bound once: log() runs on every producer thread's hot path
+_time_ns = time.time_ns
+
+# Log bucket shared by components not pre-defined in ComponentMonitor.components
+_UNKNOWN_COMPONENT = "__unknown__"
+
+# Level names (upper and lower case, so the common spellings skip .upper())
+_LEVEL_MAP = {}
+for _level in LogLevel:
+    _LEVEL_MAP[_level.name] = _LEVEL_MAP[_level.name.lower()] = _level
+del _level
+
+def _coerce_level(level):
+    """Convert a LogLevel, level name, or int (0-5) to a LogLevel"""
+    # Exact type check: LogLevel is an int subclass and needs no conversion
+    if type(level) is LogLevel:
+        return level
+    if isinstance(level, str):
+        resolved = _LEVEL_MAP.get(level)
+        return resolved if resolved is not None else _LEVEL_MAP.get(level.upper(), LogLevel.INFO)
+    if isinstance(level, int):
+        return LogLevel(level)
+    return level
+
 class ComponentMonitor:
     """Thread-safe monitor with enhanced visual stdout formatting and log level control"""
     
-    def __init__(self, default_level=LogLevel.INFO):
+    def __init__(self, default_level=LogLevel.INFO, max_log_entries=10_000,
+                 batch_size=64, flush_interval=0.01):
         self.lock = threading.Lock()
-        self.component_logs = defaultdict(list)
-        self.last_component = None  # Track component changes for grouping
+        self._last_comp_info = None  # Display info of the last written component, for grouping
         
         # Enhanced logging level control
         self.current_level = default_level
@@ -32,6 +59,9 @@ class ComponentMonitor:
         # Per-component log level overrides (optional)
         self.component_levels = {}
         
+        # True when nothing can be displayed, so log() returns before any work
+        self._disabled = (default_level == LogLevel.DISABLED)
+        
         # Pre-define all expected components with colors and icons
         self.components = {
             "Main": {"color": "\033[96m", "icon": "🚀", "width": 15},
@@ -42,6 +72,19 @@ class ComponentMonitor:
         }
         self.reset = "\033[0m"
         
+        # Effective level per component, rebuilt whenever a level changes
+        self._effective_levels = {}
+        self._refresh_effective_levels()
+        
+        # Line prefix and separator are constant per component, so build them once;
+        # components not listed above get theirs on first use
+        for name, info in self.components.items():
+            self._build_display_strings(name, info)
+        self._other_components = {}
+        
+        # (epoch second, "HH:MM:SS") - timestamps only call strftime once per second
+        self._second_cache = (None, "")
+        
         # Level-specific styling
         self.level_styles = {
             LogLevel.DEBUG: {"color": "\033[90m", "icon": "🔍", "label": "DEBUG"},
@@ -51,12 +94,47 @@ class ComponentMonitor:
             LogLevel.CRITICAL: {"color": "\033[91m\033[1m", "icon": "🔥", "label": "CRITICAL"}
         }
         
-        # Initialize empty logs for all components
-        for component in self.components.keys():
-            self.component_logs[component] = []
+        # Level color+icon prefix and label, indexed by int(level)
+        self._level_prefix = []
+        self._level_label = []
+        for level in LogLevel:
+            style = self.level_styles.get(level, {"color": "", "icon": "•", "label": level.name})
+            self._level_prefix.append(f"{style['color']}{style['icon']} ")
+            self._level_label.append(style["label"])
+        
+        # Each producer thread appends to its own log buffers and counts; log() takes
+        # no lock, since every buffer and counter has a single writer thread. self.lock guards level changes, thread registration and reader snapshots.
+        # Buffers are ring buffers: past max_log_entries the oldest entries are dropped.
+        # When a thread has exited, its entries are folded into the shared _retired
+        # buffers (same cap), so short-lived pool threads do not accumulate buffers
+        self.max_log_entries = max_log_entries
+        self._tls = threading.local()
+        self._all_buffers = {}  # thread -> (that thread's buffers, its counts)
+        self._retired = {
+            name: deque(maxlen=max_log_entries) for name in (*self.components, _UNKNOWN_COMPONENT)
+        }
         
-        # Statistics tracking
-        self.log_counts = defaultdict(lambda: defaultdict(int))
+        # Statistics tracking: counts[component_index][level], last row for unknown
+        # components. Each thread increments its own table (one writer per slot, so
+        # no increment is lost without a lock); get_statistics sums them, plus
+        # _retired_counts for threads that have exited
+        self._comp_index = {name: i for i, name in enumerate(self.components)}
+        self._unknown_index = len(self.components)
+        self._retired_counts = self._new_counts()
+        
+        # Callers only enqueue records; a single writer thread formats them and
+        # writes to stdout, so producers never block on terminal/notebook I/O.
+        # Output goes out in one write per batch_size records or flush_interval seconds
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.SimpleQueue()
+        self._enqueue = self._queue.put_nowait
+        self._closed = False
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="ComponentMonitor-Writer", daemon=True
+        )
+        self._writer_thread.start()
+        atexit.register(self.close)
         
     def set_level(self, level):
         """
@@ -65,23 +143,14 @@ class ComponentMonitor:
         Args:
             level: Can be LogLevel enum, string ("DEBUG", "INFO", etc.), or int (0-5)
         """
+        self.flush()
         with self.lock:
-            if isinstance(level, str):
-                level = level.upper()
-                level_map = {
-                    "DEBUG": LogLevel.DEBUG,
-                    "INFO": LogLevel.INFO,
-                    "WARNING": LogLevel.WARNING,
-                    "ERROR": LogLevel.ERROR,
-                    "CRITICAL": LogLevel.CRITICAL,
-                    "DISABLED": LogLevel.DISABLED
-                }
-                level = level_map.get(level, LogLevel.INFO)
-            elif isinstance(level, int):
-                level = LogLevel(level)
+            level = _coerce_level(level)
             
             self.current_level = level
             self.debug_enabled = (level == LogLevel.DEBUG)
+            self._disabled = (level == LogLevel.DISABLED and not self.component_levels)
+            self._refresh_effective_levels()
             
             if level != LogLevel.DISABLED:
                 level_name = self.level_styles.get(level, {}).get("label", str(level))
@@ -95,28 +164,104 @@ class ComponentMonitor:
             component_name: Name of the component
             level: Can be LogLevel enum, string, or int
         """
+        self.flush()
         with self.lock:
-            if isinstance(level, str):
-                level = level.upper()
-                level_map = {
-                    "DEBUG": LogLevel.DEBUG,
-                    "INFO": LogLevel.INFO,
-                    "WARNING": LogLevel.WARNING,
-                    "ERROR": LogLevel.ERROR,
-                    "CRITICAL": LogLevel.CRITICAL,
-                    "DISABLED": LogLevel.DISABLED
-                }
-                level = level_map.get(level, LogLevel.INFO)
-            elif isinstance(level, int):
-                level = LogLevel(level)
+            level = _coerce_level(level)
             
             self.component_levels[component_name] = level
+            self._disabled = False
+            self._refresh_effective_levels()
             level_name = self.level_styles.get(level, {}).get("label", str(level))
             print(f"🔧 {component_name} logging level set to: {level_name}")
     
+    def _timestamp(self, t_ns):
+        """Format a time.time_ns() value as local HH:MM:SS.mmm"""
+        second = t_ns // 1_000_000_000
+        cached = self._second_cache
+        if cached[0] != second:
+            # Swap in a new tuple so concurrent callers never see a torn pair
+            cached = self._second_cache = (second, time.strftime("%H:%M:%S", time.localtime(second)))
+        return f"{cached[1]}.{t_ns // 1_000_000 % 1000:03d}"
+    
+    def _format_entry(self, timestamp, level, message):
+        """Format a log entry as [HH:MM:SS.mmm] LEVEL: message"""
+        return f"[{timestamp}] {self._level_label[level]}: {message}"
+    
+    def _new_counts(self):
+        """Zeroed counts table: one row per known component plus one for unknown ones"""
+        return [[0] * len(LogLevel) for _ in range(len(self.components) + 1)]
+    
+    def _thread_buffers(self):
+        """Get this thread's per-component log buffers and counts, registering them on first use"""
+        try:
+            return self._tls.buffers, self._tls.counts
+        except AttributeError:
+            buffers = self._tls.buffers = {
+                name: deque(maxlen=self.max_log_entries)
+                for name in (*self.components, _UNKNOWN_COMPONENT)
+            }
+            counts = self._tls.counts = self._new_counts()
+            # Runs once per thread; new threads are also when exited ones pile up,
+            # so their buffers are retired here
+            with self.lock:
+                self._retire_dead_threads()
+                self._all_buffers[threading.current_thread()] = (buffers, counts)
+            return buffers, counts
+    
+    def _retire_dead_threads(self):
+        """Fold the buffers of exited threads into the shared retired buffers (caller holds the lock)"""
+        dead = [thread for thread in self._all_buffers if not thread.is_alive()]
+        for thread in dead:
+            buffers, counts = self._all_buffers.pop(thread)
+            for retired_row, row in zip(self._retired_counts, counts):
+                for level, count in enumerate(row):
+                    retired_row[level] += count
+            for component, logs in buffers.items():
+                if logs:
+                    retired = self._retired[component]
+                    merged = sorted((*retired, *logs), key=lambda entry: entry[0])
+                    retired.clear()
+                    retired.extend(merged)  # maxlen keeps the newest entries
+    
+    @property
+    def component_logs(self):
+        """
+        Most recent log entries per component (up to max_log_entries), merged across threads
+        
+        Entries are (time_ns, LogLevel, message) tuples; use tail() for display strings.
+        """
+        merged = {component: [] for component in self.components}
+        with self.lock:
+            for buffers in (self._retired, *(buffers for buffers, _ in self._all_buffers.values())):
+                for component, logs in buffers.items():
+                    if logs:
+                        merged.setdefault(component, []).extend(logs)
+        # Entries lead with their timestamp, so sorting restores chronological order
+        for component, logs in merged.items():
+            logs.sort(key=lambda entry: entry[0])
+            del logs[:-self.max_log_entries]
+        return merged
+    
+    def tail(self, component_name, n=20):
+        """Get a component's last n log entries formatted for display"""
+        logs = self.component_logs.get(component_name, [])
+        if n <= 0:
+            return []
+        return [self._format_entry(self._timestamp(t_ns), level, message) for t_ns, level, message in logs[-n:]]
+    
+    def _refresh_effective_levels(self):
+        """Rebuild the effective level table (swapped in whole, so log() never sees a partial one)"""
+        effective = {name: self.current_level for name in self.components}
+        effective.update(self.component_levels)
+        self._effective_levels = effective
+    
     def get_effective_level(self, component_name):
         """Get the effective logging level for a component"""
-        return self.component_levels.get(component_name, self.current_level)
+        return self._effective_levels.get(component_name, self.current_level)
+    
+    def is_enabled(self, component_name, level=LogLevel.DEBUG):
+        """Check whether a message at this level would be displayed, so callers can skip formatting it"""
+        return _coerce_level(level) >= self._effective_levels.get(component_name, self.current_level)
     
     def set_debug_mode(self, enabled):
         """Enable or disable debug logging (legacy compatibility)"""
@@ -135,74 +280,148 @@ class ComponentMonitor:
             message: The log message
             level: Log level (string, LogLevel enum, or int)
         """
-        # Convert level to LogLevel enum
-        if isinstance(level, str):
-            level = level.upper()
-            level_map = {
-                "DEBUG": LogLevel.DEBUG,
-                "INFO": LogLevel.INFO,
-                "WARNING": LogLevel.WARNING,
-                "ERROR": LogLevel.ERROR,
-                "CRITICAL": LogLevel.CRITICAL
-            }
-            log_level = level_map.get(level, LogLevel.INFO)
-        elif isinstance(level, int):
-            log_level = LogLevel(level)
-        else:
-            log_level = level
-        
-        # Check if we should display this log level
-        effective_level = self.get_effective_level(component_name)
-        if log_level < effective_level:
+        if self._disabled:
             return
         
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        level_label = self.level_styles.get(log_level, {}).get("label", str(log_level))
-        formatted_msg = f"[{timestamp}] {level_label}: {message}"
+        # Convert level to LogLevel enum (already one on internal call sites)
+        log_level = level if type(level) is LogLevel else _coerce_level(level)
         
-        with self.lock:
-            self.component_logs[component_name].append(formatted_msg)
-            self.log_counts[component_name][log_level] += 1
+        # Filtered messages return before any timestamp/format work
+        if log_level < self._effective_levels.get(component_name, self.current_level):
+            return
+        
+        # Entries are stored raw; formatting happens only when displayed
+        t_ns = _time_ns()
+        tls = self._tls
+        try:
+            buffers = tls.buffers
+            counts = tls.counts
+        except AttributeError:
+            buffers, counts = self._thread_buffers()
+        bucket = buffers.get(component_name)
+        if bucket is None:
+            bucket = buffers[_UNKNOWN_COMPONENT]
+        bucket.append((t_ns, log_level, message))
+        counts[self._comp_index.get(component_name, self._unknown_index)][log_level] += 1
+        
+        if self._closed:
+            # Writer thread is gone (interpreter shutdown) - write synchronously
+            self._write(self._format_log(component_name, self._timestamp(t_ns), log_level, message))
+            return
+        
+        # Display formatting and the stdout write happen on the writer thread
+        self._enqueue((component_name, t_ns, log_level, message))
+    
+    def _writer_loop(self):
+        """Collect queued records into batches and write each batch to stdout in one call"""
+        get = self._queue.get
+        # Records in a batch almost always share a second, so the HH:MM:SS part
+        # is kept locally and strftime only runs when the second changes
+        second, second_str = None, ""
+        while True:
+            record = get()
+            chunks = []
+            waiters = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if record is None:
+                    stop = True
+                    break
+                if isinstance(record, threading.Event):
+                    # flush() is waiting - write what we have right away
+                    waiters.append(record)
+                    break
+                component_name, t_ns, level, message = record
+                if t_ns // 1_000_000_000 != second:
+                    second = t_ns // 1_000_000_000
+                    second_str = time.strftime("%H:%M:%S", time.localtime(second))
+                timestamp = f"{second_str}.{t_ns // 1_000_000 % 1000:03d}"
+                chunks.append(self._format_log(component_name, timestamp, level, message))
+                if len(chunks) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    record = get(timeout=remaining)
+                except queue.Empty:
+                    break
             
-        # Enhanced visual formatting
-        self._print_formatted_log(component_name, formatted_msg, log_level)
-        self.last_component = component_name
+            if chunks:
+                self._write("".join(chunks))
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+    
+    @staticmethod
+    def _write(text):
+        """Write to whatever sys.stdout currently is (notebooks swap it per cell)"""
+        try:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        except (ValueError, OSError):
+            # stdout closed or redirected away - drop the output rather than kill the writer
+            pass
+    
+    def flush(self, timeout=None):
+        """Block until every message logged so far has been written to stdout"""
+        if self._closed or not self._writer_thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+    
+    def close(self, timeout=5):
+        """Write out pending messages and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer_thread.is_alive():
+            self._queue.put(None)
+            self._writer_thread.join(timeout)
     
-    def _print_formatted_log(self, component_name, message, level):
+    def _build_display_strings(self, component_name, comp_info):
+        """Precompute a component's line prefix and separator line"""
+        color = comp_info["color"]
+        component_display = f"{comp_info['icon']} {component_name}".ljust(comp_info["width"] + 2)
+        comp_info["prefix"] = f"{color}┃{self.reset} {color}{component_display}{self.reset} │ "
+        comp_info["separator"] = f"{color}{'─' * 80}{self.reset}\n"
+        return comp_info
+    
+    def _format_log(self, component_name, timestamp, level, message):
         """
-        Print log with enhanced visual formatting
+        Format a log record with enhanced visual formatting (writer thread only)
         
         Args:
             component_name: Name of the component
-            message: Formatted message with timestamp
+            timestamp: Local time the message was logged, as HH:MM:SS.mmm
             level: LogLevel enum value
+            message: The log message
+        
+        Returns:
+            str: Display lines, including a separator when the component changes
         """
         # Get component info
-        comp_info = self.components.get(component_name, {
-            "color": "", "icon": "📋", "width": 15
-        })
-        
-        color = comp_info["color"]
-        icon = comp_info["icon"]
-        width = comp_info["width"]
-        
-        # Get level-specific styling
-        level_style = self.level_styles.get(level, {"color": "", "icon": "•"})
-        level_color = level_style["color"]
-        level_icon = level_style.get("icon", "•")
+        comp_info = self.components.get(component_name) or self._other_components.get(component_name)
+        if comp_info is None:
+            comp_info = self._other_components[component_name] = self._build_display_strings(
+                component_name, {"color": "", "icon": "📋", "width": 15}
+            )
         
         # Add visual separator when switching components
-        if self.last_component and self.last_component != component_name:
-            print(f"{color}{'─' * 80}{self.reset}")
-        
-        # Format component name with consistent width and styling
-        component_display = f"{icon} {component_name}".ljust(width + 2)
+        # (identity check on the cached display info, then one concatenation below)
+        last, self._last_comp_info = self._last_comp_info, comp_info
+        separator = comp_info["separator"] if last is not comp_info and last is not None else ""
         
-        # Print with enhanced formatting and level coloring
-        print(f"{color}┃{self.reset} {color}{component_display}{self.reset} │ {level_color}{level_icon} {message}{self.reset}")
+        # Enhanced formatting and level coloring
+        return (f"{separator}{comp_info['prefix']}{self._level_prefix[level]}"
+                f"[{timestamp}] {self._level_label[level]}: {message}{self.reset}\n")
     
     def show_table(self):
         """Display monitor header and legend"""
+        self.flush()
         print("\n" + "═" * 80)
         print("🔄 COMPONENT ACTIVITY MONITOR")
         print("═" * 80)
@@ -240,18 +459,31 @@ class ComponentMonitor:
         print()
     
     def get_statistics(self):
-        """Get logging statistics for all components"""
-        stats = {}
+        """
+        Get logging statistics for all components
+        
+        Per-thread counts are summed under the lock; messages logged while the
+        snapshot is taken may or may not be included, but none are lost.
+        """
         with self.lock:
-            for component in self.components.keys():
-                stats[component] = {
-                    "total": sum(self.log_counts[component].values()),
-                    "by_level": dict(self.log_counts[component])
-                }
+            snapshot = [row[:] for row in self._retired_counts]
+            for _, counts in self._all_buffers.values():
+                for total_row, row in zip(snapshot, counts):
+                    for level, count in enumerate(row):
+                        total_row[level] += count
+        
+        stats = {}
+        for component, index in self._comp_index.items():
+            counts = snapshot[index]
+            stats[component] = {
+                "total": sum(counts),
+                "by_level": {LogLevel(level): count for level, count in enumerate(counts) if count}
+            }
         return stats
     
     def print_statistics(self):
         """Print logging statistics"""
+        self.flush()
         stats = self.get_statistics()
         print("\n" + "═" * 80)
         print("📊 LOGGING STATISTICS")
@@ -268,6 +500,12 @@ class ComponentMonitor:
 # Global monitor instance
 component_monitor = ComponentMonitor()
 
+# Chatty SDK loggers that follow set_debug_logging
+_THIRD_PARTY_LOGGERS = ("boto3", "botocore", "urllib3")
+
+# Level last applied by set_debug_logging, so repeated calls are no-ops
+_last_applied_level = None
+
 def set_debug_logging(level="INFO"):
     """
     Set logging level globally for both component monitor and Python logging
@@ -283,42 +521,28 @@ def set_debug_logging(level="INFO"):
         set_debug_logging("DISABLED")  # Disable all logging
     """
     import logging
-    import sys
-    import os
+    global _last_applied_level
     
     level = level.upper()
+    if level == _last_applied_level:
+        return
     
     if level == "DISABLED":
         # Disable all loggers
         logging.getLogger().setLevel(logging.CRITICAL + 1)
-        logging.getLogger('boto3').setLevel(logging.CRITICAL + 1)
-        logging.getLogger('botocore').setLevel(logging.CRITICAL + 1)
-        logging.getLogger('urllib3').setLevel(logging.CRITICAL + 1)
+        for name in _THIRD_PARTY_LOGGERS:
+            logging.getLogger(name).setLevel(logging.CRITICAL + 1)
         logging.disable(logging.CRITICAL)
         component_monitor.set_level(LogLevel.DISABLED)
         
-        # Redirect stdout to suppress print statements
-        sys.stdout = open(os.devnull, 'w')
-        
     elif level == "DEBUG":
-        # Re-enable stdout if it was disabled
-        if hasattr(sys.stdout, 'name') and sys.stdout.name == os.devnull:
-            sys.stdout.close()
-            sys.stdout = sys.__stdout__
-        
         logging.disable(logging.NOTSET)
         logging.getLogger().setLevel(logging.DEBUG)
-        logging.getLogger('boto3').setLevel(logging.DEBUG)
-        logging.getLogger('botocore').setLevel(logging.DEBUG)
-        logging.getLogger('urllib3').setLevel(logging.DEBUG)
+        for name in _THIRD_PARTY_LOGGERS:
+            logging.getLogger(name).setLevel(logging.DEBUG)
         component_monitor.set_level(LogLevel.DEBUG)
         
     else:
-        # Re-enable stdout if it was disabled
-        if hasattr(sys.stdout, 'name') and sys.stdout.name == os.devnull:
-            sys.stdout.close()
-            sys.stdout = sys.__stdout__
-            
         logging.disable(logging.NOTSET)
         
         # Map string levels to Python logging levels
@@ -333,9 +557,8 @@ def set_debug_logging(level="INFO"):
         
         # Set Python logging levels
         logging.getLogger().setLevel(python_level)
-        logging.getLogger('boto3').setLevel(logging.CRITICAL + 1)
-        logging.getLogger('botocore').setLevel(logging.CRITICAL + 1)
-        logging.getLogger('urllib3').setLevel(logging.CRITICAL + 1)
+        for name in _THIRD_PARTY_LOGGERS:
+            logging.getLogger(name).setLevel(logging.CRITICAL + 1)
         
         # Set component monitor logging level
         component_monitor.set_level(level)
@@ -349,6 +572,8 @@ def set_debug_logging(level="INFO"):
                 handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
                 stream_logger.addHandler(handler)
             stream_logger.warning("Please follow the instruction to ingest the live stream")
+    
+    _last_applied_level = level
 
 def set_component_logging_level(component_name, level):
     """
@@ -368,6 +593,10 @@ def log_component(component_name, message, level="INFO"):
     """Convenience function for logging"""
     component_monitor.log(component_name, message, level)
 
+def is_log_enabled(component_name, level="DEBUG"):
+    """Convenience function to check a component's log level before building a message"""
+    return component_monitor.is_enabled(component_name, level)
+
 def show_component_table():
     """Convenience function to show component activity table"""
     component_monitor.show_table()
@@ -3,22 +3,149 @@ Filmstrip Processor - Creates enhanced filmstrip grids from video frames
 Shared component used across Visual Understanding and Modality Fusion modules
 """
 
+import json
+import math
+import os
+import queue
+import subprocess
+import threading
+from contextlib import closing
+from functools import lru_cache
 import cv2
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 from typing import List, Tuple, Optional
 
+# Optional PyAV backend: decodes each video in one forward pass instead of seeking per frame
+try:
+    import av
+except ImportError:
+    av = None
+
+# Optional PyTurboJPEG encoder: calls libjpeg-turbo directly, skipping OpenCV's imwrite wrapper
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    try:
+        _turbo_jpeg = TurboJPEG()
+    except OSError:
+        # Python bindings installed but the libjpeg-turbo shared library is missing
+        _turbo_jpeg = None
+except ImportError:
+    _turbo_jpeg = None
+
+# Shrink large frames on the GPU when OpenCV is built with CUDA and a device is present
+try:
+    CUDA_RESIZE = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except (AttributeError, cv2.error):
+    CUDA_RESIZE = False
+# Smallest source frame (pixels) worth the upload/download round trip
+CUDA_RESIZE_MIN_PIXELS = 1280 * 720
+
 # Import shared components
 try:
-    from .component_monitor import log_component
+    from .component_monitor import log_component, is_log_enabled
     from .shot_change_detector import ShotChangeDetector
 except ImportError:
     # Fallback if component_monitor not available
     def log_component(component, message, level="INFO"):
         print(f"[{component}] {message}")
+    
+    def is_log_enabled(component, level="DEBUG"):
+        return True
     ShotChangeDetector = None
 
 
+def _prefetched(iterable, depth: int = 4):
+    """
+    Iterate over `iterable` from a background thread, keeping up to `depth` items ready.
+    
+    Lets video decoding (GIL released in OpenCV/FFmpeg) run ahead of the consumer.
+    Close the generator (e.g. with contextlib.closing) when stopping early; closing
+    stops and joins the producer thread.
+    """
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def produce():
+        try:
+            for item in iterable:
+                if not put((True, item)):
+                    return
+        except Exception as e:
+            put((False, e))
+            return
+        put((False, None))
+    
+    producer = threading.Thread(target=produce, name="frame-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            has_item, item = items.get()
+            if not has_item:
+                if item is not None:
+                    raise item
+                return
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def _shrinks(width: int, height: int, frame_size: Optional[Tuple[int, int]]) -> bool:
+    """Whether a width×height frame should be scaled down to frame_size (never up)"""
+    return (
+        frame_size is not None
+        and (width, height) != tuple(frame_size)
+        and width >= frame_size[0] and height >= frame_size[1]
+    )
+
+
+@lru_cache(maxsize=8)
+def _load_label_font(size: int):
+    """Load the label font once per size and share it across processors"""
+    # Try to load font
+    try:
+        return ImageFont.truetype(
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 
+            size
+        )
+    except Exception:
+        return ImageFont.load_default()
+
+
+# Upper bound on filmstrip grids rendered at once (each holds a full-size canvas)
+MAX_CONCURRENT_GRIDS = 4
+
+# Process-wide pools, reused by every call (threads start on first use). Grid workers
+# wait on cell resizes, so the two pools are kept separate; cell tasks never submit work
+_CPU_WORKERS = os.cpu_count() or 1
+_CELL_POOL = ThreadPoolExecutor(max_workers=_CPU_WORKERS, thread_name_prefix="filmstrip-cell")
+_GRID_WORKERS = min(_CPU_WORKERS, MAX_CONCURRENT_GRIDS)
+_GRID_POOL = ThreadPoolExecutor(max_workers=_GRID_WORKERS, thread_name_prefix="filmstrip-grid")
+
+# Most layouts remembered per AdaptiveFilmstripProcessor
+LAYOUT_CACHE_SIZE = 128
+
+
+# JPEG quality per color mode; 'palette' writes an 8-bit (256 color) PNG instead
+JPEG_QUALITY = {'rgb': 95, 'rgb8': 80}
+COLOR_MODES = ('rgb', 'rgb8', 'palette')
+
+
+# Characters that make up every "[r×c] | T.Ts" label, rasterized once per processor
+LABEL_CHARSET = "0123456789.×[]| s-"
+
+
 class FilmstripProcessor:
     """
     Creates enhanced filmstrip grids from video frames.
@@ -52,7 +179,8 @@ class FilmstripProcessor:
         border_color: str = 'red',
         label_bg_color: str = 'black',
         label_text_color: str = 'white',
-        shot_detector: Optional[ShotChangeDetector] = None
+        shot_detector: Optional[ShotChangeDetector] = None,
+        color_mode: str = 'rgb'
     ):
         """
         Initialize filmstrip processor.
@@ -69,7 +197,12 @@ class FilmstripProcessor:
             label_bg_color: Background color of labels (default: 'black')
             label_text_color: Text color of labels (default: 'white')
             shot_detector: Optional ShotChangeDetector for detecting scene changes
+            color_mode: Output encoding - 'rgb' (JPEG q95, default), 'rgb8' (JPEG q80)
+                or 'palette' (256-color PNG, requires a .png output path)
         """
+        if color_mode not in COLOR_MODES:
+            raise ValueError(f"Invalid color_mode: {color_mode}. Must be one of {COLOR_MODES}")
+        
         self.grid_rows = grid_rows
         self.grid_cols = grid_cols
         
@@ -84,25 +217,51 @@ class FilmstripProcessor:
         self.label_bg_color = label_bg_color
         self.label_text_color = label_text_color
         self.shot_detector = shot_detector
+        self.color_mode = color_mode
         
-        # Cross-chunk tracking
+        # Cross-chunk tracking: small grayscale thumbnail of the last frame
+        # (the shot detector keeps its own signature for cross-chunk comparison)
         self.last_frame = None
         
-        # Try to load font
-        try:
-            self.label_font = ImageFont.truetype(
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 
-                24
+        # Grid geometry depends only on the layout, so compute it once
+        self.total_width = (
+            self.grid_cols * self.cell_width + 
+            (self.grid_cols + 1) * self.border_thickness
+        )
+        self.total_height = (
+            self.grid_rows * (self.cell_height + self.label_height) + 
+            (self.grid_rows + 1) * self.border_thickness
+        )
+        # Top-left (x, y) of every cell, row-major
+        self.cell_positions = [
+            (
+                col * (self.cell_width + self.border_thickness) + self.border_thickness,
+                row * (self.cell_height + self.label_height + self.border_thickness) + self.border_thickness
             )
-        except:
-            self.label_font = ImageFont.load_default()
+            for row in range(self.grid_rows)
+            for col in range(self.grid_cols)
+        ]
+        self._border_bgr = np.array(ImageColor.getrgb(border_color)[2::-1], dtype=np.uint8)
+        
+        # Grid canvas reused across filmstrips of the same size (one per rendering thread)
+        self._local = threading.local()
+        
+        self.label_font = _load_label_font(24)
+        
+        # Label colors as BGR arrays and prerendered glyph masks for slice-based label drawing
+        self._label_bg_bgr = np.array(ImageColor.getrgb(label_bg_color)[2::-1], dtype=np.uint16)
+        self._label_text_bgr = np.array(ImageColor.getrgb(label_text_color)[2::-1], dtype=np.uint16)
+        self._glyphs = {}
+        for ch in LABEL_CHARSET:
+            self._glyph(ch)
     
     def extract_frames_from_video(
         self, 
         video_file: str, 
         start_time: float = 0.0,
         num_frames: int = 20,
-        interval: float = 1.0
+        interval: float = 1.0,
+        frame_size: Optional[Tuple[int, int]] = None
     ) -> List[Tuple[np.ndarray, float]]:
         """
         Extract frames from video file with timestamps.
@@ -112,10 +271,18 @@ class FilmstripProcessor:
             start_time: Start time offset in seconds
             num_frames: Number of frames to extract
             interval: Time interval between frames in seconds (default: 1.0 for 1 fps)
+            frame_size: Optional (width, height) to shrink frames to while decoding;
+                frames already smaller are kept at source size
         
         Returns:
             List of tuples (frame, timestamp)
         """
+        if av is not None:
+            try:
+                return self._extract_frames_av(video_file, start_time, num_frames, interval, frame_size)
+            except Exception as e:
+                log_component("FilmstripProcessor", f"   ⚠️ PyAV extraction failed ({e}), falling back to OpenCV", "WARNING")
+        
         frames_with_timestamps = []
         
         cap = cv2.VideoCapture(video_file)
@@ -130,39 +297,159 @@ class FilmstripProcessor:
                 log_component("FilmstripProcessor", f"❌ Still cannot open video file: {video_file}", "ERROR")
                 return frames_with_timestamps
         
+        # Keep only one decoded frame buffered; each seek discards whatever is queued
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        
         fps = cap.get(cv2.CAP_PROP_FPS) or 30
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         video_duration = total_frames / fps if fps > 0 else 20
         
         log_component("FilmstripProcessor", f"   📊 Video: {video_duration:.1f}s, {fps:.1f}fps, {total_frames} frames", "DEBUG")
         
-        # Extract frames at specified intervals
-        for i in range(num_frames):
-            # Seek to middle of each interval (e.g., 0.5s, 1.5s, 2.5s for 1s intervals)
-            time_offset = i * interval + (interval / 2)
-            time_ms = time_offset * 1000
-            cap.set(cv2.CAP_PROP_POS_MSEC, time_ms)
-            
-            ret, frame = cap.read()
-            
-            if ret and frame is not None:
+        # Frame index of the middle of each interval (e.g., 0.5s, 1.5s, 2.5s for 1s intervals),
+        # the first frame at or after that time like a CAP_PROP_POS_MSEC seek would land on;
+        # a target past the last frame (the final one when interval is 1/fps) takes the last frame
+        targets = [i * interval + (interval / 2) for i in range(num_frames)]
+        target_frames = [math.ceil(time_offset * fps - 1e-6) for time_offset in targets]
+        if total_frames > 0:
+            target_frames = [min(target_frame, total_frames - 1) for target_frame in target_frames]
+        
+        # Decode runs ahead on a prefetch thread while frames are stamped here
+        with closing(_prefetched(self._grab_target_frames(cap, target_frames, frame_size))) as decoded:
+            for time_offset, frame in zip(targets, decoded):
                 timestamp = start_time + time_offset
-                frames_with_timestamps.append((frame, timestamp))
-            else:
-                log_component("FilmstripProcessor", f"   ⚠️ Could not read frame at {time_offset:.1f}s", "WARNING")
-                # Add black frame as placeholder
-                if frames_with_timestamps:
-                    black_frame = np.zeros_like(frames_with_timestamps[0][0])
+                if frame is not None:
+                    frames_with_timestamps.append((frame, timestamp))
                 else:
-                    black_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-                timestamp = start_time + time_offset
-                frames_with_timestamps.append((black_frame, timestamp))
+                    log_component("FilmstripProcessor", f"   ⚠️ Could not read frame at {time_offset:.1f}s", "WARNING")
+                    # Add black frame as placeholder
+                    frames_with_timestamps.append((self._placeholder_frame(frames_with_timestamps), timestamp))
         
         cap.release()
         
         log_component("FilmstripProcessor", f"   📸 Extracted {len(frames_with_timestamps)} frames", "DEBUG")
         return frames_with_timestamps
     
+    @staticmethod
+    def _grab_target_frames(
+        cap: cv2.VideoCapture,
+        target_frames: List[int],
+        frame_size: Optional[Tuple[int, int]] = None
+    ):
+        """
+        Yield the frame at each target index (None if it cannot be read).
+        
+        Seeks once, then walks forward: grab() skips frames without converting them,
+        retrieve() only runs for the frames that are kept. Kept frames are shrunk
+        to frame_size (if given) on the decoding thread.
+        """
+        next_frame = target_frames[0] if target_frames else 0
+        if next_frame > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, next_frame)
+        
+        frame = None
+        for target_frame in target_frames:
+            # Several targets can fall on the same frame when the interval is shorter than a frame
+            if target_frame < next_frame and frame is not None:
+                yield frame
+                continue
+            
+            ret = True
+            while ret and next_frame < target_frame:
+                ret = cap.grab()
+                next_frame += 1
+            
+            frame = None
+            if ret and cap.grab():
+                next_frame += 1
+                ret, frame = cap.retrieve()
+                if ret and _shrinks(frame.shape[1], frame.shape[0], frame_size):
+                    frame = cv2.resize(frame, frame_size, interpolation=cv2.INTER_AREA)
+            yield frame
+    
+    def _extract_frames_av(
+        self,
+        video_file: str,
+        start_time: float,
+        num_frames: int,
+        interval: float,
+        frame_size: Optional[Tuple[int, int]] = None
+    ) -> List[Tuple[np.ndarray, float]]:
+        """
+        Extract frames with PyAV in a single sequential decode pass.
+        
+        Seeking with CAP_PROP_POS_MSEC re-decodes from the previous keyframe for
+        every sample; here the video is decoded once and, like the seek, the
+        first frame at or after each target time is kept, scaled by swscale
+        straight to frame_size when shrinking. Same sampling and return format
+        as extract_frames_from_video.
+        """
+        frames_with_timestamps = []
+        if num_frames <= 0:
+            return frames_with_timestamps
+        
+        # Middle of each interval (e.g., 0.5s, 1.5s, 2.5s for 1s intervals)
+        targets = [i * interval + (interval / 2) for i in range(num_frames)]
+        next_target = 0
+        
+        with av.open(video_file) as container:
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"
+            time_base = stream.time_base
+            stream_start = stream.start_time or 0
+            fps = float(stream.average_rate or 30)
+            
+            log_component("FilmstripProcessor", f"   📊 Video: {fps:.1f}fps, {stream.frames} frames (PyAV)", "DEBUG")
+            
+            def to_image(frame):
+                if _shrinks(frame.width, frame.height, frame_size):
+                    return frame.to_ndarray(
+                        width=frame_size[0], height=frame_size[1], format='bgr24', interpolation='AREA'
+                    )
+                return frame.to_ndarray(format='bgr24')
+            
+            # Demux/decode runs ahead on a prefetch thread; kept frames are converted here
+            last_frame = None
+            with closing(_prefetched(container.decode(stream))) as decoded:
+                for frame in decoded:
+                    if frame.pts is None:
+                        continue
+                    last_frame = frame
+                    frame_time = float((frame.pts - stream_start) * time_base)
+                    # Small tolerance absorbs pts rounding on frames that sit exactly on a target
+                    if frame_time + 1e-6 < targets[next_target]:
+                        continue
+                    
+                    image = to_image(frame)
+                    while next_target < num_frames and targets[next_target] <= frame_time + 1e-6:
+                        frames_with_timestamps.append((image, start_time + targets[next_target]))
+                        next_target += 1
+                    if next_target >= num_frames:
+                        break
+            
+            # Targets after the last frame's pts (e.g. the final one when interval is 1/fps)
+            # get the last decoded frame, as a seek past the end would return
+            if next_target < num_frames and last_frame is not None:
+                image = to_image(last_frame)
+                for time_offset in targets[next_target:]:
+                    frames_with_timestamps.append((image, start_time + time_offset))
+                next_target = num_frames
+        
+        # Nothing decoded at all: black placeholders
+        for time_offset in targets[next_target:]:
+            log_component("FilmstripProcessor", f"   ⚠️ Could not read frame at {time_offset:.1f}s", "WARNING")
+            frames_with_timestamps.append((self._placeholder_frame(frames_with_timestamps), start_time + time_offset))
+        
+        log_component("FilmstripProcessor", f"   📸 Extracted {len(frames_with_timestamps)} frames", "DEBUG")
+        return frames_with_timestamps
+    
+    @staticmethod
+    def _placeholder_frame(frames_with_timestamps: List[Tuple[np.ndarray, float]]) -> np.ndarray:
+        """Black frame matching already extracted frames (640×480 if none yet)"""
+        if frames_with_timestamps:
+            return np.zeros_like(frames_with_timestamps[0][0])
+        return np.zeros((480, 640, 3), dtype=np.uint8)
+    
     def create_filmstrip(
         self,
         frames_with_timestamps: List[Tuple[np.ndarray, float]],
@@ -184,27 +471,48 @@ class FilmstripProcessor:
             log_component("FilmstripProcessor", "❌ No frames provided for filmstrip", "ERROR")
             return []
         
-        # Extract frames for shot detection
-        frames = [frame for frame, _ in frames_with_timestamps]
-        
         # Detect shot changes
         shot_change_frames = []
-        if detect_shot_changes and self.shot_detector:
-            log_component("FilmstripProcessor", "   🔍 Detecting shot changes...", "DEBUG")
-            # Note: detect_batch uses self.last_frame internally for cross-chunk detection
-            shot_changes = self.shot_detector.detect_batch(frames)
-            shot_change_frames = [i for i, is_change in enumerate(shot_changes) if is_change]
-            log_component("FilmstripProcessor", f"Found {len(shot_change_frames)} shot changes at frames: {shot_change_frames}")
+        if detect_shot_changes:
+            shot_change_frames = self._detect_shot_changes(frames_with_timestamps)
         
         # Create grid
         self._create_grid(frames_with_timestamps, output_path)
         
-        # Store last frame for cross-chunk detection
-        if len(frames) > 0:
-            self.last_frame = frames[-1].copy()
+        self._remember_last_frame(frames_with_timestamps[-1][0])
         
         return shot_change_frames
     
+    def _detect_shot_changes(self, frames_with_timestamps: List[Tuple[np.ndarray, float]]) -> List[int]:
+        """
+        Run the shot detector over a grid's frames.
+        
+        Args:
+            frames_with_timestamps: List of (frame, timestamp) tuples
+        
+        Returns:
+            List of frame indices where shot changes were detected
+        """
+        if not self.shot_detector:
+            return []
+        
+        # Extract frames for shot detection
+        frames = [frame for frame, _ in frames_with_timestamps]
+        
+        log_component("FilmstripProcessor", "   🔍 Detecting shot changes...", "DEBUG")
+        # Note: detect_batch uses self.last_frame internally for cross-chunk detection
+        shot_changes = self.shot_detector.detect_batch(frames)
+        shot_change_frames = [i for i, is_change in enumerate(shot_changes) if is_change]
+        log_component("FilmstripProcessor", f"Found {len(shot_change_frames)} shot changes at frames: {shot_change_frames}")
+        return shot_change_frames
+    
+    def _remember_last_frame(self, frame: np.ndarray):
+        """Store a 32×32 grayscale fingerprint of the last frame instead of a full-size copy"""
+        # Shrink first so the color conversion only touches 32×32 pixels
+        self.last_frame = cv2.cvtColor(
+            cv2.resize(frame, (32, 32), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY
+        )
+    
     def _create_grid(
         self,
         frames_with_timestamps: List[Tuple[np.ndarray, float]],
@@ -217,108 +525,235 @@ class FilmstripProcessor:
             frames_with_timestamps: List of (frame, timestamp) tuples
             output_path: Path to save filmstrip image
         """
-        # Calculate total dimensions
-        total_width = (
-            self.grid_cols * self.cell_width + 
-            (self.grid_cols + 1) * self.border_thickness
-        )
-        total_height = (
-            self.grid_rows * (self.cell_height + self.label_height) + 
-            (self.grid_rows + 1) * self.border_thickness
-        )
-        
-        # Create white background
-        grid_image = Image.new('RGB', (total_width, total_height), color='white')
-        draw = ImageDraw.Draw(grid_image)
+        total_width = self.total_width
+        total_height = self.total_height
+        cell_width = self.cell_width
+        cell_height = self.cell_height
+        cell_positions = self.cell_positions
+        
+        # Compose frames straight into a BGR canvas, the layout OpenCV encodes from.
+        # The buffer is reused: cells and labels overwrite everything but the borders,
+        # which are drawn once per buffer, so only cells left without a frame are
+        # cleared to white below
+        canvas = getattr(self._local, 'canvas', None)
+        if canvas is None or canvas.shape != (total_height, total_width, 3):
+            canvas = self._local.canvas = np.empty((total_height, total_width, 3), dtype=np.uint8)
+            self._draw_borders(canvas)
         
         # Place frames in grid
-        max_frames = self.grid_rows * self.grid_cols
+        max_frames = len(cell_positions)
+        cells = []
+        labels = []
         for idx, (frame, timestamp) in enumerate(frames_with_timestamps[:max_frames]):
-            row = idx // self.grid_cols
-            col = idx % self.grid_cols
-            
-            # Calculate position
-            x = col * (self.cell_width + self.border_thickness) + self.border_thickness
-            y = row * (self.cell_height + self.label_height + self.border_thickness) + self.border_thickness
+            row, col = divmod(idx, self.grid_cols)
+            x, y = cell_positions[idx]
             
-            # Convert OpenCV frame (BGR) to PIL (RGB)
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_pil = Image.fromarray(frame_rgb)
-            
-            # Resize frame
+            cells.append((frame, canvas[y:y + cell_height, x:x + cell_width]))
+            labels.append((x, y + cell_height, f"[{row+1}×{col+1}] | {timestamp:.1f}s"))
+        
+        # Empty cells (fewer frames than the grid holds) stay white
+        for x, y in cell_positions[len(cells):]:
+            canvas[y:y + cell_height + self.label_height, x:x + cell_width] = 255
+        
+        # cv2.resize releases the GIL and every worker writes a disjoint cell, so no locking
+        if len(cells) > 1 and _CPU_WORKERS > 1:
+            list(_CELL_POOL.map(lambda cell: self._resize_into(*cell), cells))
+        else:
+            for frame, cell in cells:
+                self._resize_into(frame, cell)
+        
+        # Draw labels below frames from the cached glyph templates
+        for x, label_y, label_text in labels:
+            self._draw_label(canvas, x, label_y, label_text)
+        
+        # Save image
+        self._save_canvas(canvas, output_path)
+        
+        log_component("FilmstripProcessor", f"🎞️ Filmstrip created: {output_path}")
+        if is_log_enabled("FilmstripProcessor", "DEBUG"):
+            log_component("FilmstripProcessor", f"   📊 Grid: {self.grid_rows}×{self.grid_cols}, Cell: {self.cell_width}×{self.cell_height}px", "DEBUG")
+    
+    def _save_canvas(self, canvas: np.ndarray, output_path: str):
+        """
+        Encode the grid canvas according to color_mode.
+        
+        Args:
+            canvas: BGR grid canvas
+            output_path: Path to save filmstrip image
+        """
+        color_mode = self.color_mode
+        if color_mode == 'palette':
+            if output_path.lower().endswith('.png'):
+                # Median-cut quantization to 256 colors, then an 8-bit PNG
+                image = Image.fromarray(cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB))
+                image.quantize(colors=256).save(output_path)
+                return
+            log_component("FilmstripProcessor", f"   ⚠️ Palette mode needs a .png path, saving {output_path} as RGB", "WARNING")
+            color_mode = 'rgb'
+        
+        quality = JPEG_QUALITY[color_mode]
+        if _turbo_jpeg is not None and output_path.lower().endswith(('.jpg', '.jpeg')):
             try:
-                frame_resized = frame_pil.resize(
-                    (self.cell_width, self.cell_height), 
-                    Image.Resampling.LANCZOS
-                )
-            except AttributeError:
-                # Fallback for older Pillow versions
-                frame_resized = frame_pil.resize(
-                    (self.cell_width, self.cell_height), 
-                    Image.LANCZOS
+                # 4:2:0 subsampling, as cv2.imwrite uses by default
+                jpeg_bytes = _turbo_jpeg.encode(
+                    canvas, quality=quality, pixel_format=TJPF_BGR, jpeg_subsample=TJSAMP_420
                 )
+                with open(output_path, 'wb') as f:
+                    f.write(jpeg_bytes)
+                return
+            except Exception as e:
+                log_component("FilmstripProcessor", f"   ⚠️ TurboJPEG encode failed ({e}), falling back to OpenCV", "WARNING")
+        
+        # OpenCV's libjpeg-turbo encoder; PIL if OpenCV cannot write the format
+        try:
+            saved = cv2.imwrite(output_path, canvas, [
+                cv2.IMWRITE_JPEG_QUALITY, quality,
+                cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+                cv2.IMWRITE_JPEG_PROGRESSIVE, 0
+            ])
+        except cv2.error:
+            saved = False
+        if not saved:
+            Image.fromarray(cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB)).save(output_path, quality=quality)
+    
+    def _resize_into(self, frame: np.ndarray, cell: np.ndarray):
+        """
+        Resize a BGR frame into its canvas cell.
+        
+        Args:
+            frame: OpenCV frame (BGR)
+            cell: Canvas view of shape (cell_height, cell_width, 3)
+        """
+        # INTER_AREA when shrinking, Lanczos when enlarging
+        shrinking = frame.shape[1] >= self.cell_width and frame.shape[0] >= self.cell_height
+        if CUDA_RESIZE and shrinking and frame.shape[0] * frame.shape[1] >= CUDA_RESIZE_MIN_PIXELS:
+            try:
+                gpu_frame = cv2.cuda_GpuMat()
+                gpu_frame.upload(frame)
+                cell[...] = cv2.cuda.resize(
+                    gpu_frame, (self.cell_width, self.cell_height), interpolation=cv2.INTER_AREA
+                ).download()
+                return
+            except cv2.error as e:
+                log_component("FilmstripProcessor", f"   ⚠️ CUDA resize failed ({e}), using CPU", "DEBUG")
+        
+        interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_LANCZOS4
+        resized = cv2.resize(frame, (self.cell_width, self.cell_height), dst=cell, interpolation=interpolation)
+        if resized is not cell:
+            # Older OpenCV builds return a new array for non-contiguous views
+            cell[...] = resized
+    
+    def _glyph(self, ch: str) -> Tuple[np.ndarray, float, Optional[Tuple[int, int, int, int]]]:
+        """
+        Get the coverage mask, advance width and ink box of one label character.
+        
+        Glyphs are rasterized and measured once with the label font and reused for
+        every label; characters outside LABEL_CHARSET are rendered on first use.
+        The ink box is (left, top, right, bottom) of the nonzero pixels, or None
+        for blank glyphs such as the space.
+        """
+        glyph = self._glyphs.get(ch)
+        if glyph is None:
+            _, _, right, bottom = self.label_font.getbbox(ch)
+            advance = self.label_font.getlength(ch)
+            image = Image.new('L', (max(int(right), int(np.ceil(advance)), 1), max(int(bottom), 1)), 0)
+            ImageDraw.Draw(image).text((0, 0), ch, fill=255, font=self.label_font)
+            mask = np.asarray(image)
             
-            # Paste frame
-            grid_image.paste(frame_resized, (x, y))
-            
-            # Draw label below frame
-            label_y = y + self.cell_height
-            label_box = [
-                (x, label_y), 
-                (x + self.cell_width, label_y + self.label_height)
-            ]
-            draw.rectangle(label_box, fill=self.label_bg_color)
-            
-            # Create label text with grid position and timestamp
-            label_text = f"[{row+1}×{col+1}] | {timestamp:.1f}s"
-            
-            # Center text in label
-            bbox = draw.textbbox((0, 0), label_text, font=self.label_font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            text_x = x + (self.cell_width - text_width) // 2
-            text_y = label_y + (self.label_height - text_height) // 2
+            rows = np.flatnonzero(mask.any(axis=1))
+            cols = np.flatnonzero(mask.any(axis=0))
+            ink = (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1) if rows.size else None
             
-            draw.text(
-                (text_x, text_y), 
-                label_text, 
-                fill=self.label_text_color, 
-                font=self.label_font
-            )
+            glyph = (mask, advance, ink)
+            self._glyphs[ch] = glyph
+        return glyph
+    
+    def _render_label(self, label_text: str) -> np.ndarray:
+        """
+        Compose a label's coverage mask from cached glyphs, cropped to its ink.
         
-        # Draw grid borders
-        self._draw_borders(draw, total_width, total_height)
+        The label's size comes from the cached advances and ink boxes, so only
+        the inked part of each glyph is copied and the result needs no scan.
         
-        # Save image
-        grid_image.save(output_path, quality=95)
+        Args:
+            label_text: Label text
         
-        log_component("FilmstripProcessor", f"🎞️ Filmstrip created: {output_path}")
-        log_component("FilmstripProcessor", f"   📊 Grid: {self.grid_rows}×{self.grid_cols}, Cell: {self.cell_width}×{self.cell_height}px", "DEBUG")
+        Returns:
+            uint8 mask (255 = text color)
+        """
+        placed = []
+        pen = 0.0
+        for ch in label_text:
+            mask, advance, ink = self._glyph(ch)
+            if ink is not None:
+                placed.append((int(round(pen)), mask, ink))
+            pen += advance
+        
+        if not placed:
+            return np.zeros((0, 0), dtype=np.uint8)
+        
+        left = min(offset + ink[0] for offset, _, ink in placed)
+        top = min(ink[1] for _, _, ink in placed)
+        right = max(offset + ink[2] for offset, _, ink in placed)
+        bottom = max(ink[3] for _, _, ink in placed)
+        
+        line = np.zeros((bottom - top, right - left), dtype=np.uint8)
+        for offset, mask, (g_left, g_top, g_right, g_bottom) in placed:
+            x = offset + g_left - left
+            y = g_top - top
+            region = line[y:y + g_bottom - g_top, x:x + g_right - g_left]
+            np.maximum(region, mask[g_top:g_bottom, g_left:g_right], out=region)
+        return line
+    
+    def _draw_label(self, canvas: np.ndarray, x: int, label_y: int, label_text: str):
+        """
+        Fill a label box and blend its centered text into the canvas.
+        
+        Args:
+            canvas: BGR grid canvas
+            x: Left edge of the cell
+            label_y: Top edge of the label box
+            label_text: Label text
+        """
+        label = canvas[label_y:label_y + self.label_height, x:x + self.cell_width]
+        label[...] = self._label_bg_bgr
+        
+        mask = self._render_label(label_text) if label_text else None
+        if mask is None or mask.size == 0:
+            return
+        
+        # Center text in label; text larger than the box keeps its middle part
+        text_height = min(mask.shape[0], self.label_height)
+        text_width = min(mask.shape[1], self.cell_width)
+        text_x = (self.cell_width - text_width) // 2
+        text_y = (self.label_height - text_height) // 2
+        crop_x = (mask.shape[1] - text_width) // 2
+        crop_y = (mask.shape[0] - text_height) // 2
+        
+        alpha = mask[crop_y:crop_y + text_height, crop_x:crop_x + text_width, None].astype(np.uint16)
+        label[text_y:text_y + text_height, text_x:text_x + text_width] = (
+            (self._label_bg_bgr * (255 - alpha) + self._label_text_bgr * alpha + 127) // 255
+        )
     
-    def _draw_borders(self, draw: ImageDraw.Draw, total_width: int, total_height: int):
+    def _draw_borders(self, canvas: np.ndarray):
         """
-        Draw grid borders.
+        Draw grid borders as bulk slice assignments on the canvas.
         
         Args:
-            draw: PIL ImageDraw object
-            total_width: Total width of grid
-            total_height: Total height of grid
+            canvas: BGR grid canvas
         """
+        border_bgr = self._border_bgr
+        bt = self.border_thickness
+        
         # Draw horizontal borders
+        stride_y = self.cell_height + self.label_height + bt
         for i in range(self.grid_rows + 1):
-            y = i * (self.cell_height + self.label_height + self.border_thickness)
-            draw.rectangle(
-                [(0, y), (total_width, y + self.border_thickness)], 
-                fill=self.border_color
-            )
+            canvas[i * stride_y:i * stride_y + bt, :] = border_bgr
         
         # Draw vertical borders
+        stride_x = self.cell_width + bt
         for i in range(self.grid_cols + 1):
-            x = i * (self.cell_width + self.border_thickness)
-            draw.rectangle(
-                [(x, 0), (x + self.border_thickness, total_height)], 
-                fill=self.border_color
-            )
+            canvas[:, i * stride_x:i * stride_x + bt] = border_bgr
     
     def create_filmstrip_from_video(
         self,
@@ -414,6 +849,100 @@ def create_visual_filmstrip_processor(shot_detector=None) -> FilmstripProcessor:
     )
 
 
+def _probe_video(video_file: str) -> Optional[Tuple[float, Tuple[int, int], float]]:
+    """
+    Read FPS, resolution and duration from container metadata.
+    
+    Uses ffprobe, which parses headers without opening a decoder; falls back to
+    OpenCV when ffprobe is missing or cannot read the file.
+    
+    Args:
+        video_file: Path to video file
+    
+    Returns:
+        Tuple of (fps, (width, height), duration_seconds), or None if the video cannot be opened
+    """
+    cmd = [
+        'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height,r_frame_rate,nb_frames,duration:format=duration',
+        '-of', 'json', video_file
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        info = json.loads(result.stdout)
+        stream = info['streams'][0]
+        num, _, den = stream['r_frame_rate'].partition('/')
+        den = float(den or 1)
+        fps = float(num) / den if den else 0.0
+        duration = stream.get('duration') or info.get('format', {}).get('duration')
+        if duration is not None:
+            duration = float(duration)
+        elif fps > 0 and stream.get('nb_frames'):
+            duration = int(stream['nb_frames']) / fps
+        else:
+            duration = 0.0
+        return fps, (int(stream['width']), int(stream['height'])), duration
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError, IndexError, ZeroDivisionError):
+        pass
+    
+    cap = cv2.VideoCapture(video_file)
+    if not cap.isOpened():
+        return None
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        resolution = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        return fps, resolution, (total_frames / fps if fps > 0 else 0)
+    finally:
+        cap.release()
+
+
+# Smallest cell side (px) the max-frames layout will produce
+MIN_CELL_PX = 100
+# Most rows (and most cols) the max-frames layout will use
+MAX_GRID_CELLS_PER_SIDE = 20
+# (cell_width, cell_height, rows, cols) used when no computed layout fits
+FALLBACK_LAYOUT = (512, 512, 4, 5)
+
+
+def _max_frames_layout(
+    max_grid_width: int,
+    max_grid_height: int,
+    border_thickness: int,
+    label_height: int,
+    aspect_ratio: float
+) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Layout (up to 20×20) that fits the most frames in the grid size, in closed form.
+    
+    Shrinking a cell to the source aspect ratio never grows it, so every layout whose
+    raw cells are at least MIN_CELL_PX fits; rows and cols are then independent and the
+    best layout is simply the most rows times the most cols:
+    (H - bt) // rows - (bt + label) >= 100  <=>  rows <= (H - bt) // (100 + bt + label)
+    
+    Returns:
+        Tuple of (cell_width, cell_height, rows, cols), or None if no layout fits
+    """
+    rows = min(MAX_GRID_CELLS_PER_SIDE, (max_grid_height - border_thickness) // (MIN_CELL_PX + border_thickness + label_height))
+    cols = min(MAX_GRID_CELLS_PER_SIDE, (max_grid_width - border_thickness) // (MIN_CELL_PX + border_thickness))
+    if rows < 1 or cols < 1:
+        return None
+    
+    # Calculate cell dimensions for this layout
+    cell_width = (max_grid_width - (cols + 1) * border_thickness) // cols
+    cell_height = (max_grid_height - (rows + 1) * border_thickness - rows * label_height) // rows
+    
+    # Adjust cell size to maintain aspect ratio
+    if cell_width / cell_height > aspect_ratio:
+        # Width is limiting factor
+        cell_width = int(cell_height * aspect_ratio)
+    else:
+        # Height is limiting factor
+        cell_height = int(cell_width / aspect_ratio)
+    
+    return (cell_width, cell_height, rows, cols)
+
+
 class AdaptiveFilmstripProcessor:
     """
     Adaptive filmstrip processor that automatically calculates optimal frame extraction
@@ -443,7 +972,8 @@ class AdaptiveFilmstripProcessor:
         preserve_source_resolution: bool = False,
         fixed_grid_layout: Optional[Tuple[int, int]] = None,
         max_file_size_mb: Optional[float] = None,
-        shot_detector: Optional[ShotChangeDetector] = None
+        shot_detector: Optional[ShotChangeDetector] = None,
+        color_mode: str = 'rgb'
     ):
         """
         Initialize adaptive filmstrip processor.
@@ -460,7 +990,12 @@ class AdaptiveFilmstripProcessor:
             fixed_grid_layout: If provided (rows, cols), uses this fixed grid layout instead of computing optimal
             max_file_size_mb: If provided, downscale cell resolution to fit within this file size limit (in MB)
             shot_detector: Optional ShotChangeDetector for detecting scene changes
+            color_mode: Output encoding - 'rgb' (JPEG q95, default), 'rgb8' (JPEG q80)
+                or 'palette' (256-color PNG files)
         """
+        if color_mode not in COLOR_MODES:
+            raise ValueError(f"Invalid color_mode: {color_mode}. Must be one of {COLOR_MODES}")
+        
         self.max_grid_width, self.max_grid_height = max_grid_size
         self.max_grid_images = max_grid_images
         self.border_thickness = border_thickness
@@ -472,15 +1007,42 @@ class AdaptiveFilmstripProcessor:
         self.fixed_grid_layout = fixed_grid_layout
         self.max_file_size_mb = max_file_size_mb
         self.shot_detector = shot_detector
+        self.color_mode = color_mode
         
-        # Try to load font
-        try:
-            self.label_font = ImageFont.truetype(
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 
-                24
-            )
-        except:
-            self.label_font = ImageFont.load_default()
+        self.label_font = _load_label_font(24)
+        
+        # Layouts are a pure function of the video metadata and this config
+        self._layout_cache = {}
+        
+        self._fallback_layout = self._fit_fallback_layout()
+        
+        # Layout strategy is fixed by the config, so pick it once:
+        # fixed grid, then exact source resolution, otherwise maximize frames per grid
+        if fixed_grid_layout is not None:
+            self._grid_dimensions = self._fixed_grid_dimensions
+        elif preserve_source_resolution:
+            self._grid_dimensions = self._source_resolution_grid_dimensions
+        else:
+            self._grid_dimensions = self._max_frames_grid_dimensions
+    
+    def _fit_fallback_layout(self) -> Tuple[int, int, int, int]:
+        """
+        FALLBACK_LAYOUT, with cells shrunk if its grid would exceed max_grid_size.
+        
+        Returns:
+            Tuple of (cell_width, cell_height, grid_rows, grid_cols)
+        """
+        cell_width, cell_height, rows, cols = FALLBACK_LAYOUT
+        bt = self.border_thickness
+        fit_width = (self.max_grid_width - (cols + 1) * bt) // cols
+        fit_height = (self.max_grid_height - (rows + 1) * bt - rows * self.label_height) // rows
+        if fit_width >= cell_width and fit_height >= cell_height:
+            return FALLBACK_LAYOUT
+        
+        cell_width = max(1, min(cell_width, fit_width))
+        cell_height = max(1, min(cell_height, fit_height))
+        log_component("AdaptiveFilmstripProcessor", f"📐 Fallback layout {rows}×{cols} shrunk to {cell_width}×{cell_height}px cells to fit {self.max_grid_width}×{self.max_grid_height}", "DEBUG")
+        return (cell_width, cell_height, rows, cols)
     
     def calculate_optimal_layout(
         self,
@@ -508,23 +1070,31 @@ class AdaptiveFilmstripProcessor:
             - frames_to_extract: Actual number of frames to extract
             - extraction_interval: Time interval between extracted frames
         """
+        key = self._layout_cache_key(video_duration, source_fps, source_resolution)
+        cached = self._layout_cache.get(key)
+        if cached is not None:
+            if is_log_enabled("AdaptiveFilmstripProcessor", "DEBUG"):
+                log_component("AdaptiveFilmstripProcessor", f"♻️ Reusing cached layout: {cached['grid_rows']}×{cached['grid_cols']}", "DEBUG")
+            return dict(cached)
+        
         source_width, source_height = source_resolution
         
         # Calculate total frames in video
         total_frames = int(video_duration * source_fps)
         
-        log_component("AdaptiveFilmstripProcessor", f"📊 Video Analysis:", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"   Duration: {video_duration:.1f}s", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"   FPS: {source_fps}", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"   Resolution: {source_width}×{source_height}", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"   Total frames: {total_frames}", "DEBUG")
+        if is_log_enabled("AdaptiveFilmstripProcessor", "DEBUG"):
+            log_component("AdaptiveFilmstripProcessor", f"📊 Video Analysis:", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"   Duration: {video_duration:.1f}s", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"   FPS: {source_fps}", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"   Resolution: {source_width}×{source_height}", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"   Total frames: {total_frames}", "DEBUG")
         
         # Calculate cell size maintaining aspect ratio
         aspect_ratio = source_width / source_height
         
         # Start with a reasonable cell size and adjust
         # We need to fit cells in the grid considering borders and labels
-        cell_width, cell_height, grid_rows, grid_cols = self._calculate_grid_dimensions(
+        cell_width, cell_height, grid_rows, grid_cols = self._grid_dimensions(
             aspect_ratio, source_resolution
         )
         
@@ -562,15 +1132,34 @@ class AdaptiveFilmstripProcessor:
             'max_frames_capacity': max_total_frames
         }
         
-        log_component("AdaptiveFilmstripProcessor", f"🎯 Optimal Layout Calculated:", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"   Grid layout: {grid_rows}×{grid_cols} ({frames_per_grid} frames/grid)", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"   Cell size: {cell_width}×{cell_height}px", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"   Grids needed: {num_grids_needed}/{self.max_grid_images}", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"   Sampling: {'None' if sampling_rate == 1 else f'Every {sampling_rate} frames'}", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"   Frames to extract: {frames_to_extract}/{total_frames}", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"   Extraction interval: {extraction_interval:.3f}s", "DEBUG")
-        
-        return layout
+        if is_log_enabled("AdaptiveFilmstripProcessor", "DEBUG"):
+            log_component("AdaptiveFilmstripProcessor", f"🎯 Optimal Layout Calculated:", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"   Grid layout: {grid_rows}×{grid_cols} ({frames_per_grid} frames/grid)", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"   Cell size: {cell_width}×{cell_height}px", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"   Grids needed: {num_grids_needed}/{self.max_grid_images}", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"   Sampling: {'None' if sampling_rate == 1 else f'Every {sampling_rate} frames'}", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"   Frames to extract: {frames_to_extract}/{total_frames}", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"   Extraction interval: {extraction_interval:.3f}s", "DEBUG")
+        
+        if len(self._layout_cache) >= LAYOUT_CACHE_SIZE:
+            self._layout_cache.pop(next(iter(self._layout_cache)))
+        self._layout_cache[key] = layout
+        return dict(layout)
+    
+    def _layout_cache_key(
+        self,
+        video_duration: float,
+        source_fps: float,
+        source_resolution: Tuple[int, int]
+    ) -> tuple:
+        """Build the layout cache key from the inputs and every layout-affecting setting."""
+        return (
+            video_duration, source_fps, tuple(source_resolution),
+            self.max_grid_width, self.max_grid_height, self.max_grid_images,
+            self.border_thickness, self.label_height,
+            self.preserve_source_resolution, self.fixed_grid_layout,
+            self.max_file_size_mb, self.color_mode
+        )
     
     def _estimate_file_size(
         self,
@@ -636,12 +1225,14 @@ class AdaptiveFilmstripProcessor:
         total_height = grid_rows * (cell_height + self.label_height) + (grid_rows + 1) * self.border_thickness
         
         # Estimate current file size
-        current_size_mb = self._estimate_file_size(total_width, total_height)
+        quality = JPEG_QUALITY.get(self.color_mode, 95)
+        current_size_mb = self._estimate_file_size(total_width, total_height, quality)
         
-        log_component("AdaptiveFilmstripProcessor", f"📏 File Size Constraint:", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"   Current grid: {total_width}×{total_height}px", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"   Estimated size: {current_size_mb:.2f}MB", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"   Target size: {self.max_file_size_mb:.2f}MB", "DEBUG")
+        if is_log_enabled("AdaptiveFilmstripProcessor", "DEBUG"):
+            log_component("AdaptiveFilmstripProcessor", f"📏 File Size Constraint:", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"   Current grid: {total_width}×{total_height}px", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"   Estimated size: {current_size_mb:.2f}MB", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"   Target size: {self.max_file_size_mb:.2f}MB", "DEBUG")
         
         if current_size_mb <= self.max_file_size_mb:
             log_component("AdaptiveFilmstripProcessor", f"   ✅ Within size limit, no downscaling needed", "DEBUG")
@@ -656,7 +1247,7 @@ class AdaptiveFilmstripProcessor:
         new_cell_height = int(cell_height * scale_factor)
         
         # Ensure minimum cell size
-        min_cell_size = 100
+        min_cell_size = MIN_CELL_PX
         if new_cell_width < min_cell_size or new_cell_height < min_cell_size:
             log_component("AdaptiveFilmstripProcessor", f"   ⚠️ Downscaling would make cells too small ({new_cell_width}×{new_cell_height}px)", "WARNING")
             log_component("AdaptiveFilmstripProcessor", f"   Using minimum cell size: {min_cell_size}px", "DEBUG")
@@ -666,23 +1257,24 @@ class AdaptiveFilmstripProcessor:
         # Calculate new grid dimensions and verify size
         new_total_width = grid_cols * new_cell_width + (grid_cols + 1) * self.border_thickness
         new_total_height = grid_rows * (new_cell_height + self.label_height) + (grid_rows + 1) * self.border_thickness
-        new_size_mb = self._estimate_file_size(new_total_width, new_total_height)
+        new_size_mb = self._estimate_file_size(new_total_width, new_total_height, quality)
         
-        log_component("AdaptiveFilmstripProcessor", f"   🔽 Downscaling cells:", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"      Scale factor: {scale_factor:.3f}", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"      Cell: {cell_width}×{cell_height}px → {new_cell_width}×{new_cell_height}px", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"      Grid: {total_width}×{total_height}px → {new_total_width}×{new_total_height}px", "DEBUG")
-        log_component("AdaptiveFilmstripProcessor", f"      Size: {current_size_mb:.2f}MB → {new_size_mb:.2f}MB", "DEBUG")
+        if is_log_enabled("AdaptiveFilmstripProcessor", "DEBUG"):
+            log_component("AdaptiveFilmstripProcessor", f"   🔽 Downscaling cells:", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"      Scale factor: {scale_factor:.3f}", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"      Cell: {cell_width}×{cell_height}px → {new_cell_width}×{new_cell_height}px", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"      Grid: {total_width}×{total_height}px → {new_total_width}×{new_total_height}px", "DEBUG")
+            log_component("AdaptiveFilmstripProcessor", f"      Size: {current_size_mb:.2f}MB → {new_size_mb:.2f}MB", "DEBUG")
         
         return (new_cell_width, new_cell_height)
     
-    def _calculate_grid_dimensions(
+    def _fixed_grid_dimensions(
         self, 
         aspect_ratio: float, 
         source_resolution: Tuple[int, int]
     ) -> Tuple[int, int, int, int]:
         """
-        Calculate optimal grid dimensions that fit within max_grid_size.
+        Grid dimensions for the configured fixed_grid_layout.
         
         Args:
             aspect_ratio: Width/height ratio of source video
@@ -692,127 +1284,122 @@ class AdaptiveFilmstripProcessor:
             Tuple of (cell_width, cell_height, grid_rows, grid_cols)
         """
         source_width, source_height = source_resolution
+        fixed_rows, fixed_cols = self.fixed_grid_layout
+        log_component("AdaptiveFilmstripProcessor", f"📌 Using fixed grid layout: {fixed_rows}×{fixed_cols}", "DEBUG")
         
-        # If fixed_grid_layout is provided, use it
-        if self.fixed_grid_layout is not None:
-            fixed_rows, fixed_cols = self.fixed_grid_layout
-            log_component("AdaptiveFilmstripProcessor", f"📌 Using fixed grid layout: {fixed_rows}×{fixed_cols}", "DEBUG")
-            
-            # Calculate cell size based on fixed layout
-            if self.preserve_source_resolution:
-                # Use exact source resolution
-                cell_width, cell_height = source_width, source_height
-                log_component("AdaptiveFilmstripProcessor", f"   Cell size: {cell_width}×{cell_height}px (source resolution)", "DEBUG")
-            else:
-                # Calculate cell size that fits in the grid
-                available_width = self.max_grid_width - (fixed_cols + 1) * self.border_thickness
-                available_height = self.max_grid_height - (fixed_rows + 1) * self.border_thickness - fixed_rows * self.label_height
-                
-                cell_width = available_width // fixed_cols
-                cell_height = available_height // fixed_rows
-                
-                # Adjust to maintain aspect ratio
-                if cell_width / cell_height > aspect_ratio:
-                    cell_width = int(cell_height * aspect_ratio)
-                else:
-                    cell_height = int(cell_width / aspect_ratio)
-                
-                log_component("AdaptiveFilmstripProcessor", f"   Cell size: {cell_width}×{cell_height}px (calculated)", "DEBUG")
+        # Calculate cell size based on fixed layout
+        if self.preserve_source_resolution:
+            # Use exact source resolution
+            cell_width, cell_height = source_width, source_height
+            log_component("AdaptiveFilmstripProcessor", f"   Cell size: {cell_width}×{cell_height}px (source resolution)", "DEBUG")
+        else:
+            # Calculate cell size that fits in the grid
+            available_width = self.max_grid_width - (fixed_cols + 1) * self.border_thickness
+            available_height = self.max_grid_height - (fixed_rows + 1) * self.border_thickness - fixed_rows * self.label_height
             
-            # Verify the layout fits
-            total_width = fixed_cols * cell_width + (fixed_cols + 1) * self.border_thickness
-            total_height = fixed_rows * (cell_height + self.label_height) + (fixed_rows + 1) * self.border_thickness
+            cell_width = available_width // fixed_cols
+            cell_height = available_height // fixed_rows
             
-            if total_width > self.max_grid_width or total_height > self.max_grid_height:
-                log_component("AdaptiveFilmstripProcessor", f"⚠️ Fixed layout {fixed_rows}×{fixed_cols} doesn't fit in {self.max_grid_width}×{self.max_grid_height}, using fallback", "WARNING")
-                return (512, 512, 4, 5)
+            # Adjust to maintain aspect ratio
+            if cell_width / cell_height > aspect_ratio:
+                cell_width = int(cell_height * aspect_ratio)
+            else:
+                cell_height = int(cell_width / aspect_ratio)
             
+            log_component("AdaptiveFilmstripProcessor", f"   Cell size: {cell_width}×{cell_height}px (calculated)", "DEBUG")
+        
+        # Verify the layout fits
+        total_width = fixed_cols * cell_width + (fixed_cols + 1) * self.border_thickness
+        total_height = fixed_rows * (cell_height + self.label_height) + (fixed_rows + 1) * self.border_thickness
+        
+        if total_width > self.max_grid_width or total_height > self.max_grid_height:
+            log_component("AdaptiveFilmstripProcessor", f"⚠️ Fixed layout {fixed_rows}×{fixed_cols} doesn't fit in {self.max_grid_width}×{self.max_grid_height}, using fallback", "WARNING")
+            return self._fallback_layout
+        
+        if is_log_enabled("AdaptiveFilmstripProcessor", "DEBUG"):
             log_component("AdaptiveFilmstripProcessor", f"   Grid dimensions: {total_width}×{total_height}px", "DEBUG")
             log_component("AdaptiveFilmstripProcessor", f"   Frames per grid: {fixed_rows * fixed_cols}", "DEBUG")
-            
-            # Apply file size constraint if specified
-            if self.max_file_size_mb is not None:
-                cell_width, cell_height = self._apply_file_size_constraint(
-                    cell_width, cell_height, fixed_rows, fixed_cols, aspect_ratio
-                )
-            
-            return (cell_width, cell_height, fixed_rows, fixed_cols)
         
-        # If preserve_source_resolution is True, use exact source dimensions
-        if self.preserve_source_resolution:
-            log_component("AdaptiveFilmstripProcessor", f"🔒 Preserving source resolution: {source_width}×{source_height}", "DEBUG")
-            
-            # Calculate how many cells fit with exact source resolution
-            cell_width, cell_height = source_width, source_height
-            
-            # Calculate max rows and cols that fit
-            max_cols = (self.max_grid_width - self.border_thickness) // (cell_width + self.border_thickness)
-            max_rows = (self.max_grid_height - self.border_thickness) // (cell_height + self.label_height + self.border_thickness)
-            
-            if max_cols < 1 or max_rows < 1:
-                log_component("AdaptiveFilmstripProcessor", "⚠️ Source resolution too large for grid, using fallback", "WARNING")
-                return (512, 512, 4, 5)
-            
-            log_component("AdaptiveFilmstripProcessor", f"   Grid: {max_rows}×{max_cols} ({max_rows * max_cols} frames/grid)", "DEBUG")
-            
-            # Apply file size constraint if specified
-            if self.max_file_size_mb is not None:
-                cell_width, cell_height = self._apply_file_size_constraint(
-                    cell_width, cell_height, max_rows, max_cols, aspect_ratio
-                )
-            
-            return (cell_width, cell_height, max_rows, max_cols)
-        
-        # Otherwise, optimize for maximum frames
-        best_layout = None
-        max_frames = 0
-        
-        # Try different grid configurations
-        for rows in range(1, 21):  # Try up to 20 rows
-            for cols in range(1, 21):  # Try up to 20 cols
-                # Calculate cell dimensions for this layout
-                available_width = self.max_grid_width - (cols + 1) * self.border_thickness
-                available_height = self.max_grid_height - (rows + 1) * self.border_thickness - rows * self.label_height
-                
-                cell_width = available_width // cols
-                cell_height = available_height // rows
-                
-                # Check if cells are too small
-                if cell_width < 100 or cell_height < 100:
-                    continue
-                
-                # Adjust cell size to maintain aspect ratio
-                if cell_width / cell_height > aspect_ratio:
-                    # Width is limiting factor
-                    cell_width = int(cell_height * aspect_ratio)
-                else:
-                    # Height is limiting factor
-                    cell_height = int(cell_width / aspect_ratio)
-                
-                # Verify the layout fits
-                total_width = cols * cell_width + (cols + 1) * self.border_thickness
-                total_height = rows * (cell_height + self.label_height) + (rows + 1) * self.border_thickness
-                
-                if total_width <= self.max_grid_width and total_height <= self.max_grid_height:
-                    frames = rows * cols
-                    if frames > max_frames:
-                        max_frames = frames
-                        best_layout = (cell_width, cell_height, rows, cols)
+        return self._constrained_dimensions(cell_width, cell_height, fixed_rows, fixed_cols, aspect_ratio)
+    
+    def _source_resolution_grid_dimensions(
+        self, 
+        aspect_ratio: float, 
+        source_resolution: Tuple[int, int]
+    ) -> Tuple[int, int, int, int]:
+        """
+        Grid dimensions for cells at exact source resolution (preserve_source_resolution).
+        
+        Args:
+            aspect_ratio: Width/height ratio of source video
+            source_resolution: Source video resolution (width, height)
+        
+        Returns:
+            Tuple of (cell_width, cell_height, grid_rows, grid_cols)
+        """
+        source_width, source_height = source_resolution
+        log_component("AdaptiveFilmstripProcessor", f"🔒 Preserving source resolution: {source_width}×{source_height}", "DEBUG")
+        
+        # Calculate how many cells fit with exact source resolution
+        cell_width, cell_height = source_width, source_height
+        
+        # Calculate max rows and cols that fit
+        max_cols = (self.max_grid_width - self.border_thickness) // (cell_width + self.border_thickness)
+        max_rows = (self.max_grid_height - self.border_thickness) // (cell_height + self.label_height + self.border_thickness)
+        
+        if max_cols < 1 or max_rows < 1:
+            log_component("AdaptiveFilmstripProcessor", "⚠️ Source resolution too large for grid, using fallback", "WARNING")
+            return self._fallback_layout
+        
+        log_component("AdaptiveFilmstripProcessor", f"   Grid: {max_rows}×{max_cols} ({max_rows * max_cols} frames/grid)", "DEBUG")
+        
+        return self._constrained_dimensions(cell_width, cell_height, max_rows, max_cols, aspect_ratio)
+    
+    def _max_frames_grid_dimensions(
+        self, 
+        aspect_ratio: float, 
+        source_resolution: Tuple[int, int]
+    ) -> Tuple[int, int, int, int]:
+        """
+        Grid dimensions that fit the most frames within max_grid_size.
+        
+        Args:
+            aspect_ratio: Width/height ratio of source video
+            source_resolution: Source video resolution (width, height)
+        
+        Returns:
+            Tuple of (cell_width, cell_height, grid_rows, grid_cols)
+        """
+        best_layout = _max_frames_layout(
+            self.max_grid_width,
+            self.max_grid_height,
+            self.border_thickness,
+            self.label_height,
+            aspect_ratio
+        )
         
         if best_layout is None:
             # Fallback to a simple layout
             log_component("AdaptiveFilmstripProcessor", "⚠️ Using fallback layout", "WARNING")
-            return (512, 512, 4, 5)
+            return self._fallback_layout
         
         cell_width, cell_height, rows, cols = best_layout
-        
-        # Apply file size constraint if specified
+        return self._constrained_dimensions(cell_width, cell_height, rows, cols, aspect_ratio)
+    
+    def _constrained_dimensions(
+        self,
+        cell_width: int,
+        cell_height: int,
+        grid_rows: int,
+        grid_cols: int,
+        aspect_ratio: float
+    ) -> Tuple[int, int, int, int]:
+        """Apply the max_file_size_mb constraint (if set) to a layout's cell size"""
         if self.max_file_size_mb is not None:
             cell_width, cell_height = self._apply_file_size_constraint(
-                cell_width, cell_height, rows, cols, aspect_ratio
+                cell_width, cell_height, grid_rows, grid_cols, aspect_ratio
             )
-        
-        return (cell_width, cell_height, rows, cols)
+        return (cell_width, cell_height, grid_rows, grid_cols)
     
     def create_adaptive_filmstrips(
         self,
@@ -830,7 +1417,8 @@ class AdaptiveFilmstripProcessor:
         
         Args:
             video_file: Path to video file
-            output_prefix: Prefix for output files (e.g., 'filmstrip' -> 'filmstrip_0000.jpg', 'filmstrip_0001.jpg')
+            output_prefix: Prefix for output files (e.g., 'filmstrip' -> 'filmstrip_0000.jpg', 'filmstrip_0001.jpg';
+                '.png' in palette color mode)
             video_duration: Video duration in seconds (auto-detected if None)
             source_fps: Source FPS (auto-detected if None)
             source_resolution: Source resolution (auto-detected if None)
@@ -846,25 +1434,23 @@ class AdaptiveFilmstripProcessor:
         """
         log_component("AdaptiveFilmstripProcessor", f"🎬 Creating adaptive filmstrips from {video_file}")
         
-        # Auto-detect video properties if not provided
-        cap = cv2.VideoCapture(video_file)
-        if not cap.isOpened():
-            log_component("AdaptiveFilmstripProcessor", f"❌ Cannot open video file: {video_file}", "ERROR")
-            return {'layout': None, 'output_files': [], 'shot_changes': []}
-        
-        if source_fps is None:
-            source_fps = cap.get(cv2.CAP_PROP_FPS) or 30
-        
-        if source_resolution is None:
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            source_resolution = (width, height)
-        
-        if video_duration is None:
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            video_duration = total_frames / source_fps if source_fps > 0 else 0
-        
-        cap.release()
+        # Auto-detect video properties if not provided; when the caller supplies all
+        # of them the file is only opened once, by the frame extraction
+        if source_fps is None or source_resolution is None or video_duration is None:
+            probe = _probe_video(video_file)
+            if probe is None:
+                log_component("AdaptiveFilmstripProcessor", f"❌ Cannot open video file: {video_file}", "ERROR")
+                return {'layout': None, 'output_files': [], 'shot_changes': []}
+            probed_fps, probed_resolution, probed_duration = probe
+            
+            if source_fps is None:
+                source_fps = probed_fps or 30
+            
+            if source_resolution is None:
+                source_resolution = probed_resolution
+            
+            if video_duration is None:
+                video_duration = probed_duration if probed_fps > 0 else 0
         
         # Apply start_time and process_duration constraints
         actual_video_duration = video_duration
@@ -894,7 +1480,8 @@ class AdaptiveFilmstripProcessor:
             border_color=self.border_color,
             label_bg_color=self.label_bg_color,
             label_text_color=self.label_text_color,
-            shot_detector=self.shot_detector
+            shot_detector=self.shot_detector,
+            color_mode=self.color_mode
         )
         
         # Extract all frames at once
@@ -903,7 +1490,8 @@ class AdaptiveFilmstripProcessor:
             video_file=video_file,
             start_time=start_time,  # Use the specified start time
             num_frames=layout['frames_to_extract'],
-            interval=layout['extraction_interval']
+            interval=layout['extraction_interval'],
+            frame_size=layout['cell_size']  # Only cell-sized frames are ever drawn
         )
         
         # Create multiple grids
@@ -913,6 +1501,9 @@ class AdaptiveFilmstripProcessor:
         grid_rows = layout['grid_rows']
         grid_cols = layout['grid_cols']
         
+        # Shot detection carries state from one grid to the next, so it runs in order;
+        # rendering and JPEG encoding (OpenCV, GIL released) then run concurrently
+        grid_jobs = []
         for grid_idx in range(layout['num_grids_needed']):
             start_idx = grid_idx * frames_per_grid
             end_idx = min(start_idx + frames_per_grid, len(all_frames))
@@ -922,17 +1513,28 @@ class AdaptiveFilmstripProcessor:
                 break
             
             # Generate output filename
-            output_file = f"{output_prefix}_{grid_idx:04d}.jpg"
+            extension = 'png' if self.color_mode == 'palette' else 'jpg'
+            output_file = f"{output_prefix}_{grid_idx:04d}.{extension}"
             
+            shot_changes = processor._detect_shot_changes(grid_frames) if detect_shot_changes else []
+            grid_jobs.append((grid_idx, start_idx, end_idx, grid_frames, output_file, shot_changes))
+        
+        def render_grid(job):
+            grid_idx, _, _, grid_frames, output_file, _ = job
             log_component("AdaptiveFilmstripProcessor", f"🎞️ Creating grid {grid_idx + 1}/{layout['num_grids_needed']}...")
-            
-            # Create filmstrip for this grid
-            shot_changes = processor.create_filmstrip(
-                frames_with_timestamps=grid_frames,
-                output_path=output_file,
-                detect_shot_changes=detect_shot_changes
-            )
-            
+            processor._create_grid(grid_frames, output_file)
+        
+        # Each rendering thread holds its own canvas; the grid pool's size bounds that memory
+        if len(grid_jobs) > 1 and _GRID_WORKERS > 1:
+            list(_GRID_POOL.map(render_grid, grid_jobs))
+        else:
+            for job in grid_jobs:
+                render_grid(job)
+        
+        if grid_jobs:
+            processor._remember_last_frame(grid_jobs[-1][3][-1][0])
+        
+        for grid_idx, start_idx, end_idx, grid_frames, output_file, shot_changes in grid_jobs:
             # Process shot changes with timestamps and grid positions
             shot_segments = []
             for shot_idx in shot_changes:
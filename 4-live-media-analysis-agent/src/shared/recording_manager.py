@@ -3,8 +3,67 @@ Recording Manager - Manages continuous video recording from UDP stream
 Shared component used across Visual Understanding and Modality Fusion modules
 """
 
+import os
 import subprocess
 import time
+from functools import lru_cache
+
+
+# Hardware MPEG-2 encoders (MXF needs MPEG-2), in preference order, with the
+# arguments each needs before and after the input
+HW_MPEG2_ENCODERS = (
+    ('mpeg2_qsv', [], ['-c:v', 'mpeg2_qsv']),
+    ('mpeg2_vaapi', ['-vaapi_device', '/dev/dri/renderD128'],
+     ['-vf', 'format=nv12,hwupload', '-c:v', 'mpeg2_vaapi']),
+)
+SW_MPEG2_ENCODER = ([], ['-c:v', 'mpeg2video'])
+# Short synthetic input used to check that a listed encoder actually starts on this host
+ENCODER_TEST_INPUT = ['-f', 'lavfi', '-i', 'nullsrc=s=256x256:d=0.1']
+
+
+@lru_cache(maxsize=1)
+def _video_encoder_args():
+    """
+    Pick the cheapest working MPEG-2 encoder, probed once per process.
+    
+    `ffmpeg -encoders` only lists what FFmpeg was built with, so each listed
+    hardware encoder is also tried on a short test encode; the first one that
+    succeeds is used, otherwise the software encoder.
+    
+    Returns:
+        Tuple of (input options, video codec options) for the FFmpeg command
+    """
+    try:
+        encoders = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return SW_MPEG2_ENCODER
+    
+    available = {line.split()[1] for line in encoders.splitlines() if len(line.split()) > 1}
+    for name, input_args, codec_args in HW_MPEG2_ENCODERS:
+        if name not in available:
+            continue
+        if name == 'mpeg2_vaapi' and not os.path.exists('/dev/dri/renderD128'):
+            continue
+        if _encoder_works(input_args, codec_args):
+            return input_args, codec_args
+    return SW_MPEG2_ENCODER
+
+
+def _encoder_works(input_args, codec_args):
+    """Run a 0.1 s test encode to the null muxer and report whether it succeeded"""
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-loglevel', 'error', *input_args,
+             *ENCODER_TEST_INPUT, *codec_args, '-f', 'null', '-'],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return result.returncode == 0
 
 
 class RecordingManager:
@@ -37,6 +96,7 @@ class RecordingManager:
         self.output_dir = output_dir
         self.recording_file = f"{output_dir}/recording/continuous_recording_{int(time.time())}.mxf"
         self.recording_process = None
+        self.recording_log = None
         self.recording_start_time = None
         self.is_recording = False
     
@@ -44,7 +104,8 @@ class RecordingManager:
         """
         Start continuous recording from UDP stream.
         
-        Creates an MXF file with MPEG-2 video and PCM audio.
+        Creates an MXF file with MPEG-2 video and PCM audio, encoded on
+        the GPU (QSV/VAAPI) when FFmpeg offers it.
         The recording runs in a background process.
         """
         try:
@@ -58,23 +119,38 @@ class RecordingManager:
         
         udp_url = f"udp://127.0.0.1:{self.udp_port}?overrun_nonfatal=1"
         
+        input_args, codec_args = _video_encoder_args()
+        log_component("Recording", f"   Video encoder: {codec_args[-1]}", "DEBUG")
+        
         cmd = [
-            'ffmpeg', '-i', udp_url,
-            '-c:v', 'mpeg2video', '-b:v', '5M',
+            'ffmpeg', *input_args, '-i', udp_url,
+            *codec_args, '-b:v', '5M',
             '-c:a', 'pcm_s16le', '-ar', '48000',
             '-f', 'mxf', '-y', self.recording_file
         ]
         
+        # FFmpeg's log goes to a file next to the recording: an unread pipe would fill
+        # up on long recordings and block the encoder
+        try:
+            self.recording_log = open(f"{os.path.splitext(self.recording_file)[0]}.log", 'wb')
+        except OSError as e:
+            log_component("Recording", f"⚠️ Cannot open FFmpeg log file, discarding its output: {e}", "WARNING")
+            self.recording_log = None
+        
         try:
             self.recording_process = subprocess.Popen(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=self.recording_log or subprocess.DEVNULL
             )
-            self.recording_start_time = time.time()
+            self.recording_start_time = time.monotonic()
             self.is_recording = True
             log_component("Recording", f"✅ Recording started on UDP port {self.udp_port} to file: {self.recording_file}")
             
         except Exception as e:
             log_component("Recording", f"❌ Failed to start recording: {e}", "ERROR")
+            self._close_log()
     
     def stop_recording(self):
         """
@@ -107,8 +183,16 @@ class RecordingManager:
                 log_component("Recording", f"⚠️ Error stopping recording: {e}", "WARNING")
             finally:
                 self.is_recording = False
+                self._close_log()
         else:
             log_component("Recording", "✅ Recording already stopped")
+            self._close_log()
+    
+    def _close_log(self):
+        """Close the FFmpeg log file, if one is open"""
+        if self.recording_log is not None:
+            self.recording_log.close()
+            self.recording_log = None
     
     def get_recording_duration(self) -> float:
         """
@@ -117,8 +201,8 @@ class RecordingManager:
         Returns:
             Duration in seconds, or 0 if not recording
         """
-        if self.is_recording and self.recording_start_time:
-            return time.time() - self.recording_start_time
+        if self.is_recording and self.recording_start_time is not None:
+            return time.monotonic() - self.recording_start_time
         return 0.0
     
     def is_active(self) -> bool:
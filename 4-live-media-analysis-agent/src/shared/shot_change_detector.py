@@ -8,12 +8,32 @@ This module is shared across:
 - 40. modality_fused_understanding (batch frame detection with cross-chunk support)
 """
 
+import os
 import cv2
 import numpy as np
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, List, Optional
 
 
+# calcHist arguments for the 3-D HSV histogram (OpenCV hue spans 0-179)
+HIST_CHANNELS = [0, 1, 2]
+HIST_RANGES = [0, 180, 0, 256, 0, 256]
+
+# Downsample large frames through OpenCV's Transparent API when an OpenCL device is present;
+# only the small result comes back to the CPU for cvtColor/calcHist
+OPENCL_DOWNSAMPLE = cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+# Smallest frame (pixels) worth the host-device transfer
+OPENCL_MIN_PIXELS = 1280 * 720
+
+# Row bands for the early-exit MSE comparison
+MSE_ROW_TILES = 8
+
+# Process-wide pool for per-frame signatures, shared by every detector (threads start on first use)
+_SIGNATURE_WORKERS = os.cpu_count() or 1
+_SIGNATURE_POOL = ThreadPoolExecutor(max_workers=_SIGNATURE_WORKERS, thread_name_prefix="shot-signature")
+
+
 class ShotChangeDetector:
     """
     Unified shot change detection for video analysis.
@@ -41,7 +61,8 @@ class ShotChangeDetector:
         method: str = 'histogram',
         threshold: float = 0.7,
         enable_cross_chunk: bool = False,
-        hist_bins: Tuple[int, int, int] = (8, 8, 8)
+        hist_bins: Tuple[int, int, int] = (8, 8, 8),
+        detect_max_dim: Optional[int] = 320
     ):
         """
         Initialize shot change detector.
@@ -53,18 +74,27 @@ class ShotChangeDetector:
                 - For MSE: mse > threshold indicates shot change
             enable_cross_chunk: Enable cross-chunk detection (compares with previous batch's last frame)
             hist_bins: Histogram bins for each channel (H, S, V) - default (8, 8, 8)
+            detect_max_dim: Frames whose longer side exceeds this are downsampled to it
+                before comparison (None compares at full resolution) - default 320
         """
         if method not in ['histogram', 'mse']:
             raise ValueError(f"Invalid method: {method}. Must be 'histogram' or 'mse'")
+        if detect_max_dim is not None and detect_max_dim < 1:
+            raise ValueError(f"Invalid detect_max_dim: {detect_max_dim}. Must be a positive integer or None")
         
         self.method = method
         self.threshold = threshold
         self.enable_cross_chunk = enable_cross_chunk
         self.hist_bins = hist_bins
+        self._hist_size = list(hist_bins)
+        self.detect_max_dim = detect_max_dim
         
-        # State for cross-chunk detection
+        # State for cross-chunk detection (last_frame holds a grayscale frame)
         self.last_frame = None
         self.previous_histogram = None
+        # Two preallocated flat histogram slots; previous_histogram is a view of one of them
+        self._hist_ring = np.empty((2, int(np.prod(hist_bins))), dtype=np.float32)
+        self._hist_slot = 0
     
     def detect_single(self, frame: np.ndarray, frame_number: int) -> Tuple[bool, float]:
         """
@@ -79,6 +109,7 @@ class ShotChangeDetector:
         """
         detection_start = time.time()
         shot_change = False
+        frame = self._downsample(frame)
         
         if self.method == 'histogram':
             shot_change = self._detect_histogram_single(frame)
@@ -106,29 +137,37 @@ class ShotChangeDetector:
         if len(frames) < 2:
             return shot_changes
         
+        # Per-frame signatures of the downsampled frames: HSV histograms or grayscale frames.
+        # Frames are independent and OpenCV releases the GIL, so they are computed in parallel
+        if _SIGNATURE_WORKERS > 1:
+            signatures = list(_SIGNATURE_POOL.map(self._signature, frames))
+        else:
+            signatures = [self._signature(frame) for frame in frames]
+        previous = self.previous_histogram if self.method == 'histogram' else self.last_frame
+        
         # Cross-chunk detection: compare first frame with previous batch's last frame
-        if self.enable_cross_chunk and self.last_frame is not None:
-            if self.method == 'histogram':
-                is_change = self._compare_frames_histogram(self.last_frame, frames[0])
-            else:  # mse
-                is_change = self._compare_frames_mse(self.last_frame, frames[0])
-            
-            if is_change:
-                shot_changes[0] = True
+        cross_chunk = self.enable_cross_chunk and previous is not None
+        sequence = [previous, *signatures] if cross_chunk else signatures
         
-        # Detect shot changes within the batch
-        for i in range(1, len(frames)):
-            if self.method == 'histogram':
-                is_change = self._compare_frames_histogram(frames[i-1], frames[i])
-            else:  # mse
-                is_change = self._compare_frames_mse(frames[i-1], frames[i])
-            
-            if is_change:
-                shot_changes[i] = True
+        # Compare every consecutive pair in one vectorized pass
+        if self.method == 'histogram':
+            changes = self._batch_changes_histogram(sequence)
+        else:  # mse
+            changes = self._batch_changes_mse(sequence)
+        
+        if cross_chunk:
+            shot_changes = changes.tolist()
+        else:
+            shot_changes[1:] = changes.tolist()
         
-        # Store last frame for next batch (if cross-chunk enabled)
-        if self.enable_cross_chunk and frames:
-            self.last_frame = frames[-1].copy()
+        # Keep only the last frame's signature for the next batch (if cross-chunk enabled),
+        # a histogram or grayscale image rather than a copy of the full color frame
+        if self.enable_cross_chunk:
+            if self.method == 'histogram':
+                self.previous_histogram = self._store_histogram(signatures[-1])
+            else:
+                last_gray = signatures[-1]
+                self.last_frame = last_gray.copy() if last_gray is frames[-1] else last_gray
         
         return shot_changes
     
@@ -137,23 +176,50 @@ class ShotChangeDetector:
         self.last_frame = None
         self.previous_histogram = None
     
+    def _signature(self, frame: np.ndarray) -> np.ndarray:
+        """Comparison signature of a frame: HSV histogram or grayscale image, after downsampling"""
+        frame = self._downsample(frame)
+        if self.method == 'histogram':
+            return self._histogram(frame)
+        return self._grayscale(frame)
+    
+    def _downsample(self, frame: np.ndarray) -> np.ndarray:
+        """Shrink a frame so its longer side is at most detect_max_dim (smaller frames are returned as-is)"""
+        max_dim = self.detect_max_dim
+        height, width = frame.shape[:2]
+        if max_dim is None or max(height, width) <= max_dim:
+            return frame
+        
+        scale = max_dim / max(height, width)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        if OPENCL_DOWNSAMPLE and height * width >= OPENCL_MIN_PIXELS:
+            try:
+                return cv2.resize(cv2.UMat(frame), size, interpolation=cv2.INTER_AREA).get()
+            except cv2.error:
+                pass
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    
     # ========================================================================
     # Private Methods - Histogram Detection
     # ========================================================================
     
-    def _detect_histogram_single(self, frame: np.ndarray) -> bool:
-        """Detect shot change using histogram correlation (single frame mode)"""
+    def _histogram(self, frame: np.ndarray) -> np.ndarray:
+        """Calculate the HSV color histogram of a frame"""
         # Convert to HSV for better color representation
         hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
         
-        # Calculate histogram
-        hist = cv2.calcHist(
-            [hsv], 
-            [0, 1, 2], 
-            None, 
-            [self.hist_bins[0], self.hist_bins[1], self.hist_bins[2]], 
-            [0, 180, 0, 256, 0, 256]
-        )
+        return cv2.calcHist([hsv], HIST_CHANNELS, None, self._hist_size, HIST_RANGES)
+    
+    def _store_histogram(self, hist: np.ndarray) -> np.ndarray:
+        """Copy a histogram into the free ring slot and return that slot's flat view"""
+        slot = self._hist_ring[self._hist_slot]
+        slot[:] = hist.reshape(-1)
+        self._hist_slot ^= 1
+        return slot
+    
+    def _detect_histogram_single(self, frame: np.ndarray) -> bool:
+        """Detect shot change using histogram correlation (single frame mode)"""
+        hist = self._store_histogram(self._histogram(frame))
         
         # Compare with previous histogram
         if self.previous_histogram is not None:
@@ -164,30 +230,27 @@ class ShotChangeDetector:
         self.previous_histogram = hist
         return False
     
-    def _compare_frames_histogram(self, frame1: np.ndarray, frame2: np.ndarray) -> bool:
-        """Compare two frames using histogram correlation"""
-        # Convert both frames to HSV
-        hsv1 = cv2.cvtColor(frame1, cv2.COLOR_BGR2HSV)
-        hsv2 = cv2.cvtColor(frame2, cv2.COLOR_BGR2HSV)
-        
-        # Calculate histograms
-        hist1 = cv2.calcHist(
-            [hsv1], 
-            [0, 1, 2], 
-            None, 
-            [self.hist_bins[0], self.hist_bins[1], self.hist_bins[2]], 
-            [0, 180, 0, 256, 0, 256]
-        )
-        hist2 = cv2.calcHist(
-            [hsv2], 
-            [0, 1, 2], 
-            None, 
-            [self.hist_bins[0], self.hist_bins[1], self.hist_bins[2]], 
-            [0, 180, 0, 256, 0, 256]
-        )
-        
-        # Compare histograms
-        correlation = cv2.compareHist(hist1, hist2, cv2.HISTCMP_CORREL)
+    def _batch_changes_histogram(self, histograms: List[np.ndarray]) -> np.ndarray:
+        """
+        Histogram correlation between each pair of consecutive frame histograms.
+        
+        The correlations (same formula as cv2.HISTCMP_CORREL) are evaluated for
+        all pairs with array operations.
+        
+        Returns:
+            Boolean array, entry i is True when frame i -> frame i+1 is a shot change
+        """
+        hists = np.stack([hist.ravel() for hist in histograms]).astype(np.float64)
+        hists -= hists.mean(axis=1, keepdims=True)
+        prev, curr = hists[:-1], hists[1:]
+        
+        numerator = np.einsum('ij,ij->i', prev, curr)
+        denominator = np.einsum('ij,ij->i', prev, prev) * np.einsum('ij,ij->i', curr, curr)
+        
+        # Flat histograms correlate as 1.0, like compareHist
+        valid = np.abs(denominator) > np.finfo(np.float64).eps
+        correlation = np.ones(len(numerator))
+        correlation[valid] = numerator[valid] / np.sqrt(denominator[valid])
         return correlation < self.threshold
     
     # ========================================================================
@@ -196,32 +259,84 @@ class ShotChangeDetector:
     
     def _detect_mse_single(self, frame: np.ndarray) -> bool:
         """Detect shot change using MSE (single frame mode)"""
+        # Only the grayscale plane is kept; cvtColor already returns a fresh buffer
+        gray = self._grayscale(frame)
+        if gray is frame:
+            gray = frame.copy()
+        
         if self.last_frame is not None:
-            mse = self._calculate_mse(self.last_frame, frame)
-            self.last_frame = frame.copy()
-            return mse > self.threshold
+            changed = self._compare_frames_mse(self.last_frame, gray)
+            self.last_frame = gray
+            return changed
         
-        self.last_frame = frame.copy()
+        self.last_frame = gray
         return False
     
     def _compare_frames_mse(self, frame1: np.ndarray, frame2: np.ndarray) -> bool:
-        """Compare two frames using MSE"""
-        mse = self._calculate_mse(frame1, frame2)
+        """
+        Compare two frames using MSE.
+        
+        The squared error is accumulated over MSE_ROW_TILES row bands and the
+        comparison stops as soon as the running sum passes the threshold, so
+        hard cuts rarely touch the whole frame.
+        """
+        gray1, gray2 = self._aligned_grays(frame1, frame2)
+        
+        limit = self.threshold * gray1.size
+        total = 0.0
+        bounds = np.linspace(0, gray1.shape[0], MSE_ROW_TILES + 1).astype(int)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            if start == stop:
+                continue
+            total += cv2.norm(gray1[start:stop], gray2[start:stop], cv2.NORM_L2SQR)
+            if total > limit:
+                return True
+        return False
+    
+    def _batch_changes_mse(self, grays: List[np.ndarray]) -> np.ndarray:
+        """
+        MSE between each pair of consecutive grayscale frames.
+        
+        Same-sized pairs go through cv2.norm (L2 squared), a single SIMD pass per
+        pair with no widened difference arrays; mixed sizes fall back to
+        pairwise comparison.
+        
+        Returns:
+            Boolean array, entry i is True when frame i -> frame i+1 is a shot change
+        """
+        if any(gray.shape != grays[0].shape for gray in grays):
+            return np.array([
+                self._compare_frames_mse(grays[i - 1], grays[i]) for i in range(1, len(grays))
+            ], dtype=bool)
+        
+        squared = np.array([
+            cv2.norm(grays[i - 1], grays[i], cv2.NORM_L2SQR) for i in range(1, len(grays))
+        ])
+        mse = squared / (grays[0].shape[0] * grays[0].shape[1])
         return mse > self.threshold
     
-    def _calculate_mse(self, frame1: np.ndarray, frame2: np.ndarray) -> float:
-        """Calculate Mean Squared Error between two frames"""
-        # Convert to grayscale
-        gray1 = cv2.cvtColor(frame1, cv2.COLOR_BGR2GRAY)
-        gray2 = cv2.cvtColor(frame2, cv2.COLOR_BGR2GRAY)
+    @staticmethod
+    def _grayscale(frame: np.ndarray) -> np.ndarray:
+        """Convert a BGR frame to grayscale (grayscale frames are returned as-is)"""
+        if frame.ndim == 2:
+            return frame
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    
+    def _aligned_grays(self, frame1: np.ndarray, frame2: np.ndarray):
+        """Grayscale both frames, resizing the second to the first's shape if needed"""
+        gray1 = self._grayscale(frame1)
+        gray2 = self._grayscale(frame2)
         
-        # Resize if shapes don't match
         if gray1.shape != gray2.shape:
             gray2 = cv2.resize(gray2, (gray1.shape[1], gray1.shape[0]))
+        return gray1, gray2
+    
+    def _calculate_mse(self, frame1: np.ndarray, frame2: np.ndarray) -> float:
+        """Calculate Mean Squared Error between two frames (BGR or grayscale)"""
+        gray1, gray2 = self._aligned_grays(frame1, frame2)
         
-        # Calculate MSE
-        mse = np.mean((gray1.astype(float) - gray2.astype(float)) ** 2)
-        return mse
+        # Sum of squared differences in one SIMD pass, without float64 temporaries
+        return cv2.norm(gray1, gray2, cv2.NORM_L2SQR) / gray1.size
     
     # ========================================================================
     # Utility Methods
@@ -233,7 +348,8 @@ class ShotChangeDetector:
             'method': self.method,
             'threshold': self.threshold,
             'enable_cross_chunk': self.enable_cross_chunk,
-            'hist_bins': self.hist_bins
+            'hist_bins': self.hist_bins,
+            'detect_max_dim': self.detect_max_dim
         }
     
     def __repr__(self) -> str:
@@ -3,17 +3,44 @@ Transcription Handler - Processes Amazon Transcribe streaming results
 Shared component used across Audio and Modality Fusion modules
 """
 
-from datetime import datetime
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from operator import attrgetter
 from amazon_transcribe.handlers import TranscriptResultStreamHandler
 from amazon_transcribe.model import TranscriptEvent
 
 # Import component monitor
 try:
-    from .component_monitor import log_component
+    from .component_monitor import log_component, is_log_enabled
 except ImportError:
-    # Fallback if component_monitor not available
+    # Fallback if component_monitor not available: standard logging, so disabled
+    # levels cost one isEnabledFor check
+    # (handlers and levels are left to the application's logging configuration)
+    logger = logging.getLogger(__name__)
+    
+    def _level_no(level):
+        """logging level number for a level name or LogLevel member"""
+        level_no = logging.getLevelName(getattr(level, "name", str(level)).upper())
+        return level_no if isinstance(level_no, int) else logging.INFO
+    
     def log_component(component, message, level="INFO"):
-        print(f"[{component}] {message}")
+        logger.log(_level_no(level), "[%s] %s", component, message)
+    
+    def is_log_enabled(component, level="DEBUG"):
+        return logger.isEnabledFor(_level_no(level))
+
+
+_start_time = attrgetter('start_time')
+
+# Cap on the default sentence buffer (roughly an hour of speech). Once full, the oldest
+# sentences are dropped, so a long stream only keeps its recent transcript; pass your own
+# list as sentence_buffer to keep every sentence
+SENTENCE_BUFFER_MAXLEN = 1024
 
 
 class TranscriptionHandler(TranscriptResultStreamHandler):
@@ -41,6 +68,7 @@ class TranscriptionHandler(TranscriptResultStreamHandler):
             transcript_queue: Queue for transcript events (legacy, can be None)
             transcript_result_stream: Amazon Transcribe result stream
             sentence_buffer: Shared list for storing complete sentences
+                             (default: a deque keeping only the latest SENTENCE_BUFFER_MAXLEN)
             processor: Reference to TranscriptionProcessor for memory events
             transcript_file: Optional file path to write transcripts to
             sentence_log_level: Log level for sentence logging ("INFO" or "DEBUG")
@@ -52,21 +80,65 @@ class TranscriptionHandler(TranscriptResultStreamHandler):
         self.partial_buffer = {}
         self.last_processed_stable_key = None
         self.sentence_processed_keys = set()
-        self.sentence_buffer = sentence_buffer if sentence_buffer is not None else []
+        self.sentence_buffer = sentence_buffer if sentence_buffer is not None else deque(maxlen=SENTENCE_BUFFER_MAXLEN)
         self.processor = processor  # Reference to TranscriptionProcessor for memory events
         self.transcript_file = transcript_file
         self.sentence_log_level = sentence_log_level  # Control sentence logging verbosity
         
+        self._transcript_fh = None
+        self._transcript_count = 0
+        # Appends run in an executor thread; close() takes this lock so it never races one
+        self._transcript_lock = threading.Lock()
+        
+        # Wall-clock "%H:%M:%S" stamp, reformatted at most once per second
+        self._cached_ts_sec = None
+        self._cached_ts_str = ""
+        
         # Initialize transcript file if provided (JSON format)
         if self.transcript_file:
-            import os
-            import json
             os.makedirs(os.path.dirname(self.transcript_file), exist_ok=True)
-            # Initialize with empty array
-            with open(self.transcript_file, 'w') as f:
-                json.dump([], f)
+            # Initialize with empty array; kept open so sentences are appended in place
+            self._transcript_fh = open(self.transcript_file, 'wb')
+            self._transcript_fh.write(b"[]")
+            self._transcript_fh.flush()
+    
+    def _append_to_transcript_file(self, entry):
+        """
+        Append one sentence to the JSON array in the transcript file.
+        
+        Only the closing bracket is rewritten, so each sentence costs the same
+        regardless of transcript length, and the file stays a valid JSON array
+        laid out like json.dump(sentences, f, indent=2).
+        """
+        element = json.dumps(entry, indent=2).replace("\n", "\n  ")
+        with self._transcript_lock:
+            if self._transcript_fh is None:
+                return  # closed while this write was queued
+            if self._transcript_count:
+                self._transcript_fh.seek(-2, os.SEEK_END)  # before "\n]"
+                self._transcript_fh.write(f",\n  {element}\n]".encode())
+            else:
+                self._transcript_fh.seek(0)
+                self._transcript_fh.write(f"[\n  {element}\n]".encode())
+            self._transcript_fh.flush()
+            self._transcript_count += 1
+    
+    def _timestamp(self):
+        """Current local time as HH:MM:SS, cached for the rest of the second"""
+        now = int(time.time())
+        if now != self._cached_ts_sec:
+            self._cached_ts_sec = now
+            self._cached_ts_str = time.strftime("%H:%M:%S", time.localtime(now))
+        return self._cached_ts_str
     
-    def _create_sentence_from_buffer(self):
+    def close(self):
+        """Close the transcript file, if one is open, after any in-flight append"""
+        with self._transcript_lock:
+            if self._transcript_fh is not None:
+                self._transcript_fh.close()
+                self._transcript_fh = None
+    
+    async def _create_sentence_from_buffer(self):
         """
         Create a complete sentence from buffered items.
         
@@ -76,11 +148,18 @@ class TranscriptionHandler(TranscriptResultStreamHandler):
         3. Adds punctuation at the end
         4. Creates sentence with start/end timestamps
         5. Triggers memory event creation if processor available
+        
+        The transcript file write runs on the default executor so disk I/O
+        does not hold up the Transcribe event loop.
         """
         if not self.partial_buffer:
             return
         
-        sorted_items = sorted(self.partial_buffer.values(), key=lambda x: x.start_time)
+        # The buffer dict keeps arrival order, which Transcribe delivers chronologically;
+        # sort only when a revised item arrived out of order
+        sorted_items = list(self.partial_buffer.values())
+        if any(later.start_time < earlier.start_time for earlier, later in zip(sorted_items, sorted_items[1:])):
+            sorted_items.sort(key=_start_time)
         sentence_words = []
         sentence_start = None
         sentence_end = None
@@ -88,7 +167,7 @@ class TranscriptionHandler(TranscriptResultStreamHandler):
         items_to_remove = []
         
         for item in sorted_items:
-            item_key = f"{item.start_time}_{item.end_time}_{item.content}"
+            item_key = (item.start_time, item.end_time, item.content)
             
             if item.item_type == "pronunciation":
                 sentence_words.append(item.content)
@@ -103,7 +182,7 @@ class TranscriptionHandler(TranscriptResultStreamHandler):
         
         if sentence_words:
             sentence = " ".join(sentence_words) + punctuation
-            timestamp = datetime.now().strftime("%H:%M:%S")
+            timestamp = self._timestamp()
             
             sentence_data = {
                 'sentence': sentence,
@@ -114,33 +193,27 @@ class TranscriptionHandler(TranscriptResultStreamHandler):
             
             self.sentence_buffer.append(sentence_data)
             
-            log_component("Transcription", f"📝 Sentence: {sentence} ({sentence_start:.1f}s-{sentence_end:.1f}s)", self.sentence_log_level)
+            # sentence_log_level is DEBUG in modality fusion; skip formatting when it is hidden
+            if is_log_enabled("Transcription", self.sentence_log_level):
+                log_component("Transcription", f"📝 Sentence: {sentence} ({sentence_start:.1f}s-{sentence_end:.1f}s)", self.sentence_log_level)
             
             # Write to transcript file if configured (JSON format)
-            if self.transcript_file:
+            if self._transcript_fh is not None:
                 try:
-                    import json
-                    # Read existing data
-                    with open(self.transcript_file, 'r') as f:
-                        sentences = json.load(f)
-                    
                     # Append new sentence in the format expected by _get_transcript_for_timerange
-                    sentences.append({
+                    await asyncio.get_running_loop().run_in_executor(None, self._append_to_transcript_file, {
                         "start_time": sentence_start,
                         "end_time": sentence_end,
                         "sentence": sentence,
                         "timestamp": timestamp
                     })
-                    
-                    # Write back
-                    with open(self.transcript_file, 'w') as f:
-                        json.dump(sentences, f, indent=2)
                 except Exception as e:
                     log_component("Transcription", f"⚠️ Failed to write to transcript file: {e}", "WARNING")
             
             # Trigger memory event creation if processor is available
             if self.processor:
-                log_component("Transcription", f"🔍 _add_sentence_for_memory_event called (sentence: '{sentence_data.get('sentence', '')[:50]}...')", "DEBUG")
+                if is_log_enabled("Transcription", "DEBUG"):
+                    log_component("Transcription", f"🔍 _add_sentence_for_memory_event called (sentence: '{sentence_data.get('sentence', '')[:50]}...')", "DEBUG")
                 self.processor._add_sentence_for_memory_event(sentence_data)
             else:
                 # Debug: log if processor is not available
@@ -177,25 +250,25 @@ class TranscriptionHandler(TranscriptResultStreamHandler):
                             
                             for item in alt.items:
                                 if hasattr(item, 'item_type'):
-                                    item_key = f"{item.start_time}_{item.end_time}_{item.content}"
+                                    item_key = (item.start_time, item.end_time, item.content)
                                     
                                     if not found_last_processed:
                                         if item_key == self.last_processed_stable_key:
                                             found_last_processed = True
                                         continue
                                     
-                                    if hasattr(item, 'stable') and item.stable:
+                                    if getattr(item, 'stable', False):
                                         if item_key not in self.partial_buffer:
                                             self.partial_buffer[item_key] = item
                                             self.last_processed_stable_key = item_key
                                             
                                             if item.item_type == "punctuation":
-                                                self._create_sentence_from_buffer()
+                                                await self._create_sentence_from_buffer()
                     else:
                         if hasattr(alt, 'items') and alt.items:
                             for item in alt.items:
                                 if hasattr(item, 'item_type'):
-                                    item_key = f"{item.start_time}_{item.end_time}_{item.content}"
+                                    item_key = (item.start_time, item.end_time, item.content)
                                     
                                     if item_key in self.sentence_processed_keys:
                                         continue
@@ -204,7 +277,7 @@ class TranscriptionHandler(TranscriptResultStreamHandler):
                                         self.partial_buffer[item_key] = item
                                         
                                         if item.item_type == "punctuation":
-                                            self._create_sentence_from_buffer()
+                                            await self._create_sentence_from_buffer()
                         
                         remaining_items = {k: v for k, v in self.partial_buffer.items() if k not in self.sentence_processed_keys}
                         self.partial_buffer = remaining_items
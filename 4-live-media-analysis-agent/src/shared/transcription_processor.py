@@ -4,25 +4,63 @@ Shared component used across Audio and Modality Fusion modules
 """
 
 import asyncio
-import time
 import json
+import logging
+from collections import deque
 from datetime import datetime
 from amazon_transcribe.client import TranscribeStreamingClient
 from amazon_transcribe.exceptions import BadRequestException
 
 # Import shared components
 try:
-    from .transcription_handler import TranscriptionHandler
-    from .component_monitor import log_component
+    from .transcription_handler import TranscriptionHandler, SENTENCE_BUFFER_MAXLEN
+    from .component_monitor import log_component, is_log_enabled
 except ImportError:
     # Fallback imports
     try:
-        from transcription_handler import TranscriptionHandler
+        from transcription_handler import TranscriptionHandler, SENTENCE_BUFFER_MAXLEN
     except ImportError:
         TranscriptionHandler = None
+        SENTENCE_BUFFER_MAXLEN = 1024
+    
+    # Standard logging, so disabled levels cost one isEnabledFor check
+    # (handlers and levels are left to the application's logging configuration)
+    logger = logging.getLogger(__name__)
+    
+    def _level_no(level):
+        """logging level number for a level name or LogLevel member"""
+        level_no = logging.getLevelName(getattr(level, "name", str(level)).upper())
+        return level_no if isinstance(level_no, int) else logging.INFO
     
     def log_component(component, message, level="INFO"):
-        print(f"[{component}] {message}")
+        logger.log(_level_no(level), "[%s] %s", component, message)
+    
+    def is_log_enabled(component, level="DEBUG"):
+        return logger.isEnabledFor(_level_no(level))
+
+
+# Audio is read from FFmpeg in 200 ms chunks (16 kHz mono s16le = 32000 bytes/s)
+AUDIO_CHUNK_BYTES = 6400
+# StreamReader buffer limit, so bursts from FFmpeg are absorbed without pausing the pipe
+FFMPEG_STDOUT_LIMIT = 1 << 20
+# Capture stops after this long without audio; until the first audio arrives a
+# reminder is logged at each interval
+STREAM_TIMEOUT_SECONDS = 60
+WAITING_LOG_INTERVAL_SECONDS = 5
+# How long cleanup waits for the result handler after the audio stream is ended
+HANDLER_SHUTDOWN_TIMEOUT_SECONDS = 2
+
+# Streaming clients by region, shared across sessions so endpoint and credential
+# resolution happens once; each session still opens its own stream
+_TRANSCRIBE_CLIENTS = {}
+
+
+def _transcribe_client(region):
+    """Return the shared TranscribeStreamingClient for a region, creating it on first use"""
+    client = _TRANSCRIBE_CLIENTS.get(region)
+    if client is None:
+        client = _TRANSCRIBE_CLIENTS[region] = TranscribeStreamingClient(region=region)
+    return client
 
 
 class TranscriptionProcessor:
@@ -62,6 +100,7 @@ class TranscriptionProcessor:
             udp_port: UDP port for audio stream
             aws_region: AWS region for Transcribe service
             sentence_buffer: Shared list for storing complete sentences
+                             (default: a deque keeping only the latest SENTENCE_BUFFER_MAXLEN)
             memory_client: AgentCore Memory client
             memory_id: Memory ID for storing transcripts
             actor_id: Actor ID for memory events
@@ -71,12 +110,16 @@ class TranscriptionProcessor:
         self.udp_port = udp_port
         self.aws_region = aws_region
         self.output_dir = output_dir
+        self.transcript_file = f"{output_dir}/transcripts/live_transcript.json"
         self.is_running = False
         self.transcribe_client = None
         self.stream = None
         self.handler = None
-        self.sentence_buffer = sentence_buffer if sentence_buffer is not None else []
+        self.sentence_buffer = sentence_buffer if sentence_buffer is not None else deque(maxlen=SENTENCE_BUFFER_MAXLEN)
         self.ffmpeg_process = None  # Store FFmpeg process reference
+        self._waiting_log_handle = None
+        self._handler_task = None  # Task consuming Transcribe results
+        self._stderr_task = None  # Task forwarding FFmpeg's log
         
         # AgentCore memory integration
         self.memory_client = memory_client
@@ -112,11 +155,11 @@ class TranscriptionProcessor:
         Initialize AWS Transcribe streaming client.
         
         Creates:
-        - TranscribeStreamingClient
+        - TranscribeStreamingClient (shared per region)
         - Streaming transcription session
         - TranscriptionHandler for processing results
         """
-        self.transcribe_client = TranscribeStreamingClient(region=self.aws_region)
+        self.transcribe_client = _transcribe_client(self.aws_region)
         
         self.stream = await self.transcribe_client.start_stream_transcription(
             language_code='en-US',
@@ -125,18 +168,12 @@ class TranscriptionProcessor:
             enable_partial_results_stabilization=True
         )
         
-        # Create transcript file path
-        import os
-        transcript_file = None
-        if hasattr(self, 'output_dir'):
-            transcript_file = f"{self.output_dir}/transcripts/live_transcript.json"
-        
         self.handler = TranscriptionHandler(
             None, 
             self.stream.output_stream, 
             self.sentence_buffer, 
             processor=self,
-            transcript_file=transcript_file,
+            transcript_file=self.transcript_file,
             sentence_log_level="DEBUG"  # Hide sentences in modality fusion
         )
         
@@ -152,7 +189,7 @@ class TranscriptionProcessor:
             except Exception as e:
                 log_component("Transcription", f"❌ Unexpected transcription error: {e}", "ERROR")
         
-        asyncio.create_task(handle_events_with_exception_handling())
+        self._handler_task = asyncio.create_task(handle_events_with_exception_handling(), name="transcribe-handler")
         
         log_component("Transcription", "✅ Transcription stream initialized")
     
@@ -169,70 +206,115 @@ class TranscriptionProcessor:
         """
         udp_url = f"udp://127.0.0.1:{self.udp_port}"
         
+        # Headerless PCM (Transcribe's "pcm" encoding), with FFmpeg's input buffering turned
+        # down so the first audio reaches Transcribe sooner
         ffmpeg_command = [
-            'ffmpeg', '-i', udp_url,
-            '-f', 'wav', '-ac', '1', '-ar', '16000',
-            '-c:a', 'pcm_s16le', '-'
+            'ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'warning',
+            '-fflags', 'nobuffer', '-flags', 'low_delay', '-i', udp_url,
+            '-f', 's16le', '-ac', '1', '-ar', '16000',
+            '-c:a', 'pcm_s16le', '-flush_packets', '1', '-'
         ]
         
         log_component("Transcription", f"🎵 Starting audio capture on UDP port {self.udp_port}")
         
         self.ffmpeg_process = await asyncio.create_subprocess_exec(
-            *ffmpeg_command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            *ffmpeg_command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=FFMPEG_STDOUT_LIMIT
+        )
+        # stderr is drained concurrently: an unread pipe would fill and stall FFmpeg
+        self._stderr_task = asyncio.create_task(
+            self._drain_stderr(self.ffmpeg_process.stderr), name="ffmpeg-stderr"
         )
         
-        # Wait for stream with timeout
-        stream_timeout_seconds = 60
-        last_data_time = time.time()
+        # Stream timeout and "waiting" reminders are scheduled on the event loop
+        # rather than polled between reads; the timeout is re-armed whenever audio arrives
+        loop = asyncio.get_running_loop()
         client_initialized = False
+        timeout_handle = loop.call_later(STREAM_TIMEOUT_SECONDS, self._on_stream_timeout, client_initialized)
+        self._waiting_log_handle = loop.call_later(
+            WAITING_LOG_INTERVAL_SECONDS, self._log_waiting, STREAM_TIMEOUT_SECONDS - WAITING_LOG_INTERVAL_SECONDS
+        )
         
         try:
             while self.is_running:
                 try:
-                    data = await asyncio.wait_for(self.ffmpeg_process.stdout.read(1024 * 2), timeout=1.0)
+                    data = await self.ffmpeg_process.stdout.readexactly(AUDIO_CHUNK_BYTES)
+                    stream_ended = False
+                except asyncio.IncompleteReadError as e:
+                    # End of stream (or FFmpeg terminated): forward whatever was left, then stop
+                    data = e.partial
+                    stream_ended = True
+                
+                if data:
+                    if not client_initialized:
+                        self._waiting_log_handle.cancel()
+                        await self._initialize_transcribe_client()
+                        client_initialized = True
                     
-                    if data:
-                        if not client_initialized:
-                            await self._initialize_transcribe_client()
-                            client_initialized = True
-                        
-                        last_data_time = time.time()
-                        
-                        if self.stream:
-                            await self.stream.input_stream.send_audio_event(audio_chunk=data)
-                    elif not data:
-                        log_component("Transcription", "⚠️ Audio stream ended. Stopping...", "WARNING")
-                        break
-                        
-                except asyncio.TimeoutError:
-                    time_since_last_data = time.time() - last_data_time
-                    if time_since_last_data >= stream_timeout_seconds:
-                        if not client_initialized:
-                            log_component("Transcription", f"❌ No audio data received for {stream_timeout_seconds} seconds.", "ERROR")
-                            log_component("Transcription", "   Please start the FFmpeg ingest command first!", "ERROR")
-                        else:
-                            log_component("Transcription", f"⚠️ No audio data for {stream_timeout_seconds} seconds. Stream may have stopped.", "WARNING")
-                        self.is_running = False
-                        break
+                    timeout_handle.cancel()
+                    timeout_handle = loop.call_later(STREAM_TIMEOUT_SECONDS, self._on_stream_timeout, client_initialized)
                     
-                    if int(time_since_last_data) % 5 == 0 and int(time_since_last_data) > 0:
-                        remaining_wait = stream_timeout_seconds - int(time_since_last_data)
-                        if not client_initialized:
-                            log_component("Transcription", f"⏳ Waiting for audio data... ({remaining_wait}s remaining)")
+                    if self.stream:
+                        await self.stream.input_stream.send_audio_event(audio_chunk=data)
+                
+                if stream_ended:
+                    if self.is_running:
+                        log_component("Transcription", "⚠️ Audio stream ended. Stopping...", "WARNING")
+                    break
                     
         except Exception as e:
             log_component("Transcription", f"❌ Audio capture error: {e}", "ERROR")
         finally:
+            timeout_handle.cancel()
+            self._waiting_log_handle.cancel()
             if self.ffmpeg_process and self.ffmpeg_process.returncode is None:
                 self.ffmpeg_process.terminate()
                 await self.ffmpeg_process.wait()
+            if self._stderr_task:
+                # Ends at EOF once FFmpeg has exited
+                await self._stderr_task
+                self._stderr_task = None
+    
+    async def _drain_stderr(self, stderr):
+        """Forward FFmpeg's log lines (warnings and errors, per -loglevel) as warnings"""
+        try:
+            async for line in stderr:
+                message = line.decode(errors='replace').rstrip()
+                if message:
+                    log_component("Transcription", f"⚠️ FFmpeg: {message}", "WARNING")
+        except Exception as e:
+            log_component("Transcription", f"⚠️ Error reading FFmpeg log: {e}", "WARNING")
+    
+    def _on_stream_timeout(self, client_initialized):
+        """Stop capturing after STREAM_TIMEOUT_SECONDS without audio (scheduled with loop.call_later)"""
+        if not client_initialized:
+            log_component("Transcription", f"❌ No audio data received for {STREAM_TIMEOUT_SECONDS} seconds.", "ERROR")
+            log_component("Transcription", "   Please start the FFmpeg ingest command first!", "ERROR")
+        else:
+            log_component("Transcription", f"⚠️ No audio data for {STREAM_TIMEOUT_SECONDS} seconds. Stream may have stopped.", "WARNING")
+        self.is_running = False
+        
+        # Terminating FFmpeg ends its stdout, which wakes the pending read
+        if self.ffmpeg_process and self.ffmpeg_process.returncode is None:
+            self.ffmpeg_process.terminate()
+    
+    def _log_waiting(self, remaining_wait):
+        """Remind that no audio has arrived yet, every WAITING_LOG_INTERVAL_SECONDS until the timeout"""
+        log_component("Transcription", f"⏳ Waiting for audio data... ({remaining_wait}s remaining)")
+        if remaining_wait > WAITING_LOG_INTERVAL_SECONDS:
+            self._waiting_log_handle = asyncio.get_running_loop().call_later(
+                WAITING_LOG_INTERVAL_SECONDS, self._log_waiting, remaining_wait - WAITING_LOG_INTERVAL_SECONDS
+            )
     
     async def _cleanup(self):
         """
         Cleanup transcription resources.
         
         Closes:
-        - Transcribe streaming session
+        - Transcribe streaming session (and waits for its result handler)
         - FFmpeg process
         - Any open connections
         """
@@ -242,6 +324,25 @@ class TranscriptionProcessor:
             except Exception as e:
                 log_component("Transcription", f"⚠️ Error ending stream: {e}", "WARNING")
         
+        # Let the result handler drain the final transcripts, but bound shutdown at
+        # HANDLER_SHUTDOWN_TIMEOUT_SECONDS
+        handler_task, self._handler_task = self._handler_task, None
+        try:
+            if handler_task:
+                try:
+                    await asyncio.wait_for(asyncio.shield(handler_task), timeout=HANDLER_SHUTDOWN_TIMEOUT_SECONDS)
+                except asyncio.TimeoutError:
+                    handler_task.cancel()
+                    log_component("Transcription", "⚠️ Transcript handler did not finish in time - cancelled", "WARNING")
+                except asyncio.CancelledError:
+                    # Cleanup itself was cancelled: stop the shielded handler too, then propagate
+                    handler_task.cancel()
+                    raise
+        finally:
+            if self.handler:
+                # Blocks until a transcript write already running in the executor has finished
+                self.handler.close()
+        
         log_component("Transcription", "✅ Transcription cleanup complete")
     
     def _add_sentence_for_memory_event(self, sentence_data):
@@ -257,7 +358,10 @@ class TranscriptionProcessor:
         Args:
             sentence_data: Dictionary with sentence, start_time, end_time
         """
-        log_component("Transcription", f"🔍 _add_sentence_for_memory_event called (sentence: '{sentence_data.get('sentence', '')[:50]}...')", "DEBUG")
+        # Runs for every sentence: skip building DEBUG messages unless they will be shown
+        debug = is_log_enabled("Transcription", "DEBUG")
+        if debug:
+            log_component("Transcription", f"🔍 _add_sentence_for_memory_event called (sentence: '{sentence_data.get('sentence', '')[:50]}...')", "DEBUG")
         
         if not self.memory_client or not self.memory_id:
             # Only log once when first sentence is detected
@@ -269,22 +373,24 @@ class TranscriptionProcessor:
         self.sentences_for_next_event.append(sentence_data)
         self.sentence_count_since_last_event += 1
         
-        log_component("Transcription", f"📝 Accumulated {self.sentence_count_since_last_event} sentences for memory event", "DEBUG")
+        if debug:
+            log_component("Transcription", f"📝 Accumulated {self.sentence_count_since_last_event} sentences for memory event", "DEBUG")
         
         # Create event every 10 sentences
         # DISABLED: Memory events temporarily disabled to avoid errors
         # if self.sentence_count_since_last_event >= 10:
-        #     self._create_memory_event_for_transcripts()
+        #     asyncio.get_running_loop().create_task(self._create_memory_event_for_transcripts())
     
-    def _create_memory_event_for_transcripts(self):
+    async def _create_memory_event_for_transcripts(self):
         """
         Create memory event with accumulated transcripts.
         
         This method:
-        1. Formats sentences as JSON
-        2. Creates AgentCore Memory event
+        1. Takes the accumulated sentences and resets the buffer
+        2. Formats sentences as JSON and creates the AgentCore Memory event
+           in a worker thread, so audio capture keeps running meanwhile
         3. Logs success/failure
-        4. Resets sentence buffer
+        4. Puts the sentences back in front of the buffer if the event failed
         """
         if not self.memory_client or not self.memory_id:
             log_component("Transcription", "⚠️ Cannot create memory event - memory client not configured", "WARNING")
@@ -294,43 +400,51 @@ class TranscriptionProcessor:
             log_component("Transcription", "⚠️ No sentences to save to memory", "WARNING")
             return
         
+        # Snapshot and reset before awaiting so new sentences keep accumulating
+        snapshot = self.sentences_for_next_event
+        self.sentences_for_next_event = []
+        self.sentence_count_since_last_event = 0
+        
         try:
-            log_component("Transcription", f"💾 Creating memory event with {len(self.sentences_for_next_event)} sentences...", "DEBUG")
+            log_component("Transcription", f"💾 Creating memory event with {len(snapshot)} sentences...", "DEBUG")
             
-            # Format sentences as JSON string
-            transcript_json = json.dumps(self.sentences_for_next_event, indent=2)
+            await asyncio.to_thread(self._do_create_event, snapshot)
             
-            # Create event with transcript data
-            messages = [
-                {
-                    'conversational': {
-                        'content': {
-                            'text': transcript_json
-                        },
-                        'role': 'ASSISTANT'
-                    }
-                }
-            ]
-            self.memory_client.create_event(
-                memoryId=self.memory_id,
-                actorId=self.actor_id,
-                sessionId=self.session_id,
-                eventTimestamp=datetime.now(),
-                payload=messages
-            )
-            
-            log_component("Transcription", f"✅ Memory event created successfully with {len(self.sentences_for_next_event)} sentences")
+            log_component("Transcription", f"✅ Memory event created successfully with {len(snapshot)} sentences")
             log_component("Transcription", f"   Memory ID: {self.memory_id}", "DEBUG")
             log_component("Transcription", f"   Session ID: {self.session_id}", "DEBUG")
             
-            # Reset counters
-            self.sentence_count_since_last_event = 0
-            self.sentences_for_next_event = []
-            
         except Exception as e:
             log_component("Transcription", f"❌ Failed to create memory event: {e}", "ERROR")
             import traceback
             log_component("Transcription", f"   Traceback: {traceback.format_exc()}", "ERROR")
+            
+            self.sentences_for_next_event[:0] = snapshot
+            self.sentence_count_since_last_event += len(snapshot)
+    
+    def _do_create_event(self, sentences):
+        """Serialize sentences and create the memory event (blocking; runs in a worker thread)"""
+        # Format sentences as JSON string
+        transcript_json = json.dumps(sentences, indent=2)
+        
+        # Create event with transcript data
+        messages = [
+            {
+                'conversational': {
+                    'content': {
+                        'text': transcript_json
+                    },
+                    'role': 'ASSISTANT'
+                }
+            }
+        ]
+        self.memory_client.create_event(
+            memoryId=self.memory_id,
+            actorId=self.actor_id,
+            sessionId=self.session_id,
+            eventTimestamp=datetime.now(),
+            payload=messages
+        )
     
     async def stop_transcription(self):
         """
@@ -348,7 +462,7 @@ class TranscriptionProcessor:
         # Create final memory event with remaining sentences
         # DISABLED: Memory events temporarily disabled
         # if self.sentences_for_next_event:
-        #     self._create_memory_event_for_transcripts()
+        #     await self._create_memory_event_for_transcripts()
         
         # Check if FFmpeg process exists and is still running
         if self.ffmpeg_process: